@@ -12,6 +12,7 @@ Usage:
     python scraper.py              # smart refresh (only stale data)
     python scraper.py --force      # force re-pull everything
     python scraper.py --query      # dump current DB contents
+    python scraper.py --quiet      # refresh without dumping the DB afterwards
 """
 
 import os
@@ -19,11 +20,17 @@ import re
 import sys
 import sqlite3
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timedelta
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree, html as lxml_html
 from dotenv import load_dotenv
 
 # ── Config ───────────────────────────────────────────────────────────
@@ -60,8 +67,38 @@ log = logging.getLogger("etlab_scraper")
 #  DATABASE
 # =====================================================================
 
+def _connect(path: Path = DB_PATH, *, read_only: bool = False) -> sqlite3.Connection:
+    """Open the DB with WAL journaling and relaxed fsync.
+
+    synchronous=NORMAL is crash-safe under WAL and skips the per-commit
+    fsync; temp tables and a ~20 MB page cache stay in memory.
+    Read-only connections may be shared across threads.
+    """
+    if read_only:
+        db = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True, check_same_thread=False)
+    else:
+        db = sqlite3.connect(str(path))
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+    db.execute("PRAGMA temp_store=MEMORY")
+    db.execute("PRAGMA cache_size=-20000")
+    return db
+
+
+def _schema_exists(db: sqlite3.Connection) -> bool:
+    """True once the full schema (including the newest object) is in place."""
+    return db.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_marks_subject_code'"
+    ).fetchone() is not None
+
+
 def init_db(db: sqlite3.Connection) -> None:
     """Create tables if they don't exist."""
+    if not _schema_exists(db):
+        _create_schema(db)
+
+
+def _create_schema(db: sqlite3.Connection) -> None:
     db.executescript("""
         CREATE TABLE IF NOT EXISTS marks (
             id              INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -75,6 +112,9 @@ def init_db(db: sqlite3.Connection) -> None:
             UNIQUE(subject_code, semester, exam_number)
         );
 
+        -- Lookup path for attendance → subject name resolution
+        CREATE INDEX IF NOT EXISTS idx_marks_subject_code ON marks(subject_code);
+
         CREATE TABLE IF NOT EXISTS attendance (
             id              INTEGER PRIMARY KEY AUTOINCREMENT,
             subject_code    TEXT    NOT NULL UNIQUE,
@@ -101,7 +141,7 @@ def init_db(db: sqlite3.Connection) -> None:
         -- Tracks when each data category was last refreshed
         CREATE TABLE IF NOT EXISTS scrape_meta (
             category    TEXT PRIMARY KEY,
-            last_scraped TEXT NOT NULL
+            last_scraped INTEGER NOT NULL   -- Unix timestamp
         );
     """)
     db.commit()
@@ -109,36 +149,66 @@ def init_db(db: sqlite3.Connection) -> None:
 
 def _needs_refresh(db: sqlite3.Connection, category: str, max_age: timedelta) -> bool:
     """Return True if `category` was never scraped or is older than max_age."""
+    # Older DBs stored ISO strings here; those cast to their leading year,
+    # read as stale, and get rewritten as a timestamp on the next scrape.
     row = db.execute(
-        "SELECT last_scraped FROM scrape_meta WHERE category = ?",
+        "SELECT CAST(last_scraped AS INTEGER) FROM scrape_meta WHERE category = ?",
         (category,),
     ).fetchone()
     if not row:
         return True
-    last = datetime.fromisoformat(row[0])
-    stale = datetime.now() - last > max_age
+    age = int(time.time()) - row[0]
+    stale = age > max_age.total_seconds()
     if stale:
-        log.info("%s data is stale (last: %s)", category, row[0])
+        log.info("%s data is stale (last: %ds ago)", category, age)
     else:
-        log.info("%s data is fresh (last: %s)", category, row[0])
+        log.info("%s data is fresh (last: %ds ago)", category, age)
     return stale
 
 
+def _stale_categories(path: Path = DB_PATH) -> tuple[bool, bool, bool]:
+    """
+    (marks, attendance, timetable) staleness, read through a read-only
+    connection so the all-fresh path never takes a write lock or runs DDL.
+    A missing or uninitialised DB counts as stale everywhere.
+    """
+    if not path.exists():
+        return True, True, True
+    try:
+        db = _connect(path, read_only=True)
+    except sqlite3.Error:
+        return True, True, True
+    try:
+        return (
+            _needs_refresh(db, "marks",      MARKS_MAX_AGE),
+            _needs_refresh(db, "attendance", ATTENDANCE_MAX_AGE),
+            _needs_refresh(db, "timetable",  TIMETABLE_MAX_AGE),
+        )
+    except sqlite3.OperationalError:  # no scrape_meta yet
+        return True, True, True
+    finally:
+        db.close()
+
+
 def _update_meta(db: sqlite3.Connection, category: str) -> None:
+    """Stamp `category` as refreshed.  Runs inside the caller's transaction."""
     db.execute(
         "INSERT OR REPLACE INTO scrape_meta (category, last_scraped) VALUES (?, ?)",
-        (category, datetime.now().isoformat()),
+        (category, int(time.time())),
     )
-    db.commit()
 
 
 # =====================================================================
 #  LOGIN
 # =====================================================================
 
-def _extract_csrf_token(html: str) -> str | None:
-    match = re.search(r'"YII_CSRF_TOKEN"\s*:\s*"([^"]+)"', html)
-    return match.group(1) if match else None
+# Matched against the raw response bytes so the login page is never decoded
+_CSRF_RE = re.compile(rb'"YII_CSRF_TOKEN"\s*:\s*"([^"]+)"')
+
+
+def _extract_csrf_token(html: bytes) -> str | None:
+    match = _CSRF_RE.search(html)
+    return match.group(1).decode() if match else None
 
 
 def create_session() -> requests.Session:
@@ -147,18 +217,27 @@ def create_session() -> requests.Session:
         raise RuntimeError("ETLAB_USERNAME / ETLAB_PASSWORD not set in .env")
 
     session = requests.Session()
+    # One pooled keep-alive connection per host so every scrape after the
+    # login reuses the same TLS session; retry transient gateway errors.
+    adapter = HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=4,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("https://", adapter)
     session.headers.update({
         "User-Agent": (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
             "AppleWebKit/537.36 (KHTML, like Gecko) "
             "Chrome/125.0.0.0 Safari/537.36"
         ),
+        "Accept-Encoding": "gzip, deflate",
     })
 
     log.info("Fetching login page …")
     resp = session.get(LOGIN_URL, timeout=REQUEST_TIMEOUT)
     resp.raise_for_status()
-    csrf = _extract_csrf_token(resp.text)
+    csrf = _extract_csrf_token(resp.content)
 
     payload = {
         "LoginForm[username]": ETLAB_USERNAME,
@@ -172,7 +251,7 @@ def create_session() -> requests.Session:
     resp = session.post(LOGIN_URL, data=payload, allow_redirects=True, timeout=REQUEST_TIMEOUT)
     resp.raise_for_status()
 
-    if "/user/login" in resp.url and "login-form" in resp.text:
+    if "/user/login" in resp.url and b"login-form" in resp.content:
         raise RuntimeError("Login failed — check credentials in .env")
 
     log.info("Login OK → %s", resp.url)
@@ -183,40 +262,57 @@ def create_session() -> requests.Session:
 #  SCRAPERS
 # =====================================================================
 
+# Every scraper reads only the first <table>; skip building the rest of the page.
+_TABLE_ONLY = SoupStrainer("table")
+
+
 def _parse_subject_code_name(raw: str) -> tuple[str, str]:
     """
     '24CST403 - DESIGN AND ANALYSIS OF ALGORITHMS' → ('24CST403', 'DESIGN AND ANALYSIS OF ALGORITHMS')
     """
-    parts = raw.split(" - ", 1)
-    if len(parts) == 2:
-        return parts[0].strip(), parts[1].strip()
-    return "", raw.strip()
+    head, sep, tail = raw.partition(" - ")
+    return (head.strip(), tail.strip()) if sep else ("", raw.strip())
 
 
 # ── Marks ────────────────────────────────────────────────────────────
 
+# Conflict target is the table's UNIQUE constraint, so lookups go through
+# its implicit index; executemany prepares this once for the whole batch.
+_MARKS_UPSERT = """
+    INSERT INTO marks (subject_code, subject_name, semester, exam_number,
+                       max_marks, marks_obtained, scraped_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(subject_code, semester, exam_number) DO UPDATE SET
+        subject_name   = excluded.subject_name,
+        max_marks      = excluded.max_marks,
+        marks_obtained = excluded.marks_obtained,
+        scraped_at     = excluded.scraped_at
+"""
+
+
 def scrape_marks(session: requests.Session, db: sqlite3.Connection) -> int:
     """Scrape sessional exam marks (first table on the results page)."""
     log.info("Fetching marks: %s", RESULTS_URL)
     resp = session.get(RESULTS_URL, timeout=REQUEST_TIMEOUT)
     resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+    soup = BeautifulSoup(resp.content, "lxml", parse_only=_TABLE_ONLY)
 
-    tables = soup.find_all("table")
-    if not tables:
+    # First table = sessional exam marks
+    table = soup.find("table")
+    if not table:
         log.warning("No tables found on results page")
         return 0
 
-    # First table = sessional exam marks
-    table = tables[0]
     tbody = table.find("tbody") or table
     now = datetime.now().isoformat()
-    count = 0
+    rows: list[tuple] = []
 
     for tr in tbody.find_all("tr"):
-        cells = [td.get_text(strip=True) for td in tr.find_all("td")]
-        if len(cells) < 5:
+        # Only the first five columns are read
+        tds = tr.find_all("td", limit=5)
+        if len(tds) < 5:
             continue
+        cells = [td.get_text(strip=True) for td in tds]
 
         code, name = _parse_subject_code_name(cells[0])
         semester   = cells[1]
@@ -233,26 +329,27 @@ def scrape_marks(session: requests.Session, db: sqlite3.Connection) -> int:
         except ValueError:
             obtained = None  # "Results not published" etc.
 
-        db.execute("""
-            INSERT INTO marks (subject_code, subject_name, semester, exam_number,
-                               max_marks, marks_obtained, scraped_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(subject_code, semester, exam_number) DO UPDATE SET
-                subject_name   = excluded.subject_name,
-                max_marks      = excluded.max_marks,
-                marks_obtained = excluded.marks_obtained,
-                scraped_at     = excluded.scraped_at
-        """, (code, name, semester, exam_num, max_marks, obtained, now))
-        count += 1
+        rows.append((code, name, semester, exam_num, max_marks, obtained, now))
 
-    db.commit()
-    _update_meta(db, "marks")
-    log.info("Saved %d mark rows", count)
-    return count
+    with db:
+        db.execute("BEGIN IMMEDIATE")
+        db.executemany(_MARKS_UPSERT, rows)
+        _update_meta(db, "marks")
+    log.info("Saved %d mark rows", len(rows))
+    return len(rows)
 
 
 # ── Attendance ───────────────────────────────────────────────────────
 
+# '22/24 (92%)' → attended, total, percentage
+_ATTEND_RE = re.compile(r"(\d+)/(\d+)\s*\((\d+)%\)")
+
+
+def _cell_text(el) -> str:
+    """Each text node stripped, then joined — bs4's get_text(strip=True)."""
+    return "".join(s.strip() for s in el.itertext())
+
+
 def scrape_attendance(session: requests.Session, db: sqlite3.Connection) -> int:
     """
     Scrape subjectwise attendance.
@@ -263,68 +360,78 @@ def scrape_attendance(session: requests.Session, db: sqlite3.Connection) -> int:
     log.info("Fetching attendance: %s", ATTENDANCE_URL)
     resp = session.get(ATTENDANCE_URL, timeout=REQUEST_TIMEOUT)
     resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
-
-    table = soup.find("table")
-    if not table:
+    # This table is one column per subject, so walk it with lxml directly
+    # rather than paying for a bs4 Tag per cell.
+    try:
+        tables = lxml_html.fromstring(resp.content).xpath("(//table)[1]")
+    except etree.ParserError:  # empty body
+        tables = []
+    if not tables:
         log.warning("No attendance table found")
         return 0
+    table = tables[0]
 
     # Headers = subject codes (skip first 3: UNi Reg No, Roll No, Name)
     # and skip last 2: Total, Percentage
-    thead = table.find("thead")
-    headers = [th.get_text(strip=True) for th in thead.find_all(["th", "td"])] if thead else []
+    headers = [
+        _cell_text(th)
+        for th in table.xpath("(.//thead)[1]//*[self::th or self::td]")
+    ]
     subject_codes = headers[3:-2]  # just the subject code columns
 
     # Our row (should be only one student row or we find ours)
-    tbody = table.find("tbody") or table
-    rows = tbody.find_all("tr")
+    tbody = table.xpath("(.//tbody)[1]")
+    trs = tbody[0].xpath(".//tr") if tbody else table.xpath(".//tr")
     now = datetime.now().isoformat()
-    count = 0
+    rows: list[tuple] = []
 
-    for tr in rows:
-        cells = [td.get_text(strip=True) for td in tr.find_all("td")]
-        if len(cells) < len(headers):
+    for tr in trs:
+        tds = tr.xpath(".//td")
+        if len(tds) < len(headers):
             continue
 
-        # cells[3:-2] correspond to subject_codes
+        # tds[3:-2] correspond to subject_codes; the rest are never read
         for i, code in enumerate(subject_codes):
-            cell_val = cells[3 + i]
+            cell_val = _cell_text(tds[3 + i])
             # Parse '22/24 (92%)' → attended=22, total=24, pct=92
-            m = re.match(r"(\d+)/(\d+)\s*\((\d+)%\)", cell_val)
+            m = _ATTEND_RE.match(cell_val)
             if not m:
                 continue
             attended = int(m.group(1))
             total = int(m.group(2))
             pct = float(m.group(3))
 
-            db.execute("""
-                INSERT INTO attendance (subject_code, classes_attended, classes_total,
-                                        percentage, scraped_at)
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(subject_code) DO UPDATE SET
-                    classes_attended = excluded.classes_attended,
-                    classes_total    = excluded.classes_total,
-                    percentage       = excluded.percentage,
-                    scraped_at       = excluded.scraped_at
-            """, (code, attended, total, pct, now))
-            count += 1
-
-    # Also try to populate subject_name from marks table
-    db.execute("""
-        UPDATE attendance SET subject_name = (
-            SELECT m.subject_name FROM marks m
-            WHERE m.subject_code = attendance.subject_code
-            LIMIT 1
-        ) WHERE subject_name IS NULL AND EXISTS (
-            SELECT 1 FROM marks m WHERE m.subject_code = attendance.subject_code
-        )
-    """)
-
-    db.commit()
-    _update_meta(db, "attendance")
-    log.info("Saved %d attendance rows", count)
-    return count
+            rows.append((code, code, attended, total, pct, now))
+
+    # Names resolve from marks at insert time (via idx_marks_subject_code);
+    # keep an existing name if marks has nothing for the code.
+    with db:
+        db.execute("BEGIN IMMEDIATE")
+        db.executemany("""
+            INSERT INTO attendance (subject_code, subject_name, classes_attended,
+                                    classes_total, percentage, scraped_at)
+            VALUES (?, (SELECT subject_name FROM marks WHERE subject_code = ? LIMIT 1),
+                    ?, ?, ?, ?)
+            ON CONFLICT(subject_code) DO UPDATE SET
+                subject_name     = COALESCE(excluded.subject_name, attendance.subject_name),
+                classes_attended = excluded.classes_attended,
+                classes_total    = excluded.classes_total,
+                percentage       = excluded.percentage,
+                scraped_at       = excluded.scraped_at
+        """, rows)
+        _update_meta(db, "attendance")
+    log.info("Saved %d attendance rows", len(rows))
+    return len(rows)
+
+
+def _backfill_attendance_names(db: sqlite3.Connection) -> None:
+    """Populate attendance.subject_name from the marks table (SQLite ≥ 3.33)."""
+    with db:
+        db.execute("""
+            UPDATE attendance AS a SET subject_name = m.subject_name
+            FROM marks AS m
+            WHERE m.subject_code = a.subject_code AND a.subject_name IS NULL
+        """)
 
 
 # ── Timetable ────────────────────────────────────────────────────────
@@ -336,6 +443,29 @@ _SUBJECT_RE = re.compile(
     r"^([\w\d]+)\s*-\s*(.+?)\[\s*(Theory|Lab|Practical|Tutorial)\s*\](.*)$",
     re.IGNORECASE,
 )
+_CLASS_TYPES = {"theory", "lab", "practical", "tutorial"}
+
+
+def _split_slot(cell_text: str) -> tuple[str, str, str, str] | None:
+    """
+    Fast path for the usual 'CODE - NAME[ Type ]TEACHER' cell using plain
+    partitions.  Returns None for anything unusual so the caller falls
+    back to _SUBJECT_RE, which stays the reference behaviour.
+    """
+    if "\n" in cell_text:
+        return None
+    head, sep, tail = cell_text.partition(" - ")
+    if not sep or not head.isalnum():
+        return None
+    name, sep, rest = tail.partition("[")
+    name = name.strip()
+    if not sep or not name:
+        return None
+    ctype, sep, teacher = rest.partition("]")
+    ctype = ctype.strip()
+    if not sep or ctype.lower() not in _CLASS_TYPES:
+        return None
+    return head, name, ctype, teacher.strip().rstrip(",")
 
 
 def scrape_timetable(session: requests.Session, db: sqlite3.Connection) -> int:
@@ -345,14 +475,13 @@ def scrape_timetable(session: requests.Session, db: sqlite3.Connection) -> int:
     log.info("Fetching timetable: %s", TIMETABLE_URL)
     resp = session.get(TIMETABLE_URL, timeout=REQUEST_TIMEOUT)
     resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+    soup = BeautifulSoup(resp.content, "lxml", parse_only=_TABLE_ONLY)
 
-    tables = soup.find_all("table")
-    if not tables:
+    table = soup.find("table")
+    if not table:
         log.warning("No timetable tables found")
         return 0
 
-    table = tables[0]
     thead = table.find("thead")
     headers_raw = [th.get_text(strip=True) for th in thead.find_all(["th", "td"])] if thead else []
 
@@ -368,10 +497,7 @@ def scrape_timetable(session: requests.Session, db: sqlite3.Connection) -> int:
 
     tbody = table.find("tbody") or table
     now = datetime.now().isoformat()
-    count = 0
-
-    # Clear old timetable before inserting (full replace)
-    db.execute("DELETE FROM timetable")
+    rows: list[tuple] = []
 
     for tr in tbody.find_all("tr"):
         cells = tr.find_all("td")
@@ -388,17 +514,15 @@ def scrape_timetable(session: requests.Session, db: sqlite3.Connection) -> int:
 
             if not cell_text or cell_text.lower() == "free period":
                 # Still insert so Thursday knows a slot is free
-                db.execute("""
-                    INSERT INTO timetable (day, period, period_time, subject_code,
-                                           subject_name, class_type, teacher, scraped_at)
-                    VALUES (?, ?, ?, NULL, 'Free Period', NULL, NULL, ?)
-                """, (day, period_num, period_time, now))
-                count += 1
+                rows.append((day, period_num, period_time, None, "Free Period", None, None, now))
                 continue
 
             # Try structured parse:  24CST403 - DESIGN ...[ Theory ]TEACHER NAME
-            m = _SUBJECT_RE.match(cell_text)
-            if m:
+            slot = _split_slot(cell_text)
+            m = None if slot else _SUBJECT_RE.match(cell_text)
+            if slot:
+                code, name, ctype, teacher = slot
+            elif m:
                 code = m.group(1).strip()
                 name = m.group(2).strip()
                 ctype = m.group(3).strip()
@@ -410,60 +534,77 @@ def scrape_timetable(session: requests.Session, db: sqlite3.Connection) -> int:
                 ctype = "Lab" if "LAB" in cell_text.upper() else ""
                 teacher = ""
 
-            db.execute("""
-                INSERT INTO timetable (day, period, period_time, subject_code,
-                                       subject_name, class_type, teacher, scraped_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (day, period_num, period_time, code, name, ctype, teacher, now))
-            count += 1
+            rows.append((day, period_num, period_time, code, name, ctype, teacher, now))
 
-    db.commit()
-    _update_meta(db, "timetable")
-    log.info("Saved %d timetable slots", count)
-    return count
+    # Full replace in one transaction so readers never see an empty table
+    with db:
+        db.execute("BEGIN IMMEDIATE")
+        db.execute("DELETE FROM timetable")
+        db.executemany("""
+            INSERT INTO timetable (day, period, period_time, subject_code,
+                                   subject_name, class_type, teacher, scraped_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        _update_meta(db, "timetable")
+    log.info("Saved %d timetable slots", len(rows))
+    return len(rows)
 
 
 # =====================================================================
 #  ORCHESTRATOR
 # =====================================================================
 
+def _run_scraper(scrape, session: requests.Session) -> int:
+    """Run one scraper on its own connection (connections stay per-thread)."""
+    db = _connect()
+    try:
+        return scrape(session, db)
+    finally:
+        db.close()
+
+
 def refresh(force: bool = False) -> None:
     """
     Smart refresh: only re-scrape data that is stale.
     If force=True, re-scrape everything regardless.
     """
-    db = sqlite3.connect(str(DB_PATH))
-    init_db(db)
-
-    need_marks      = force or _needs_refresh(db, "marks",      MARKS_MAX_AGE)
-    need_attendance = force or _needs_refresh(db, "attendance",  ATTENDANCE_MAX_AGE)
-    need_timetable  = force or _needs_refresh(db, "timetable",  TIMETABLE_MAX_AGE)
+    if force:
+        need_marks = need_attendance = need_timetable = True
+    else:
+        need_marks, need_attendance, need_timetable = _stale_categories(DB_PATH)
+        if not (need_marks or need_attendance or need_timetable):
+            log.info("All data is fresh — nothing to do.")
+            return
 
-    if not (need_marks or need_attendance or need_timetable):
-        log.info("All data is fresh — nothing to do.")
-        db.close()
-        return
+    db = _connect()
+    init_db(db)
 
     # Only login if we actually need to scrape something
     session = create_session()
 
+    todo = [
+        (need_marks,      "marks",      scrape_marks),
+        (need_attendance, "attendance", scrape_attendance),
+        (need_timetable,  "timetable",  scrape_timetable),
+    ]
+
+    # The three pages are independent and network-bound, so fetch them
+    # concurrently; WAL lets each thread write through its own connection.
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="scrape") as pool:
+        futures = {
+            pool.submit(_run_scraper, scrape, session): name
+            for needed, name, scrape in todo if needed
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                log.error("Failed to scrape %s: %s", futures[future], e)
+
+    # Attendance resolves names as it inserts; only fresh marks can fill
+    # in names for codes that had none (e.g. attendance landed first)
     if need_marks:
-        try:
-            scrape_marks(session, db)
-        except Exception as e:
-            log.error("Failed to scrape marks: %s", e)
-
-    if need_attendance:
-        try:
-            scrape_attendance(session, db)
-        except Exception as e:
-            log.error("Failed to scrape attendance: %s", e)
-
-    if need_timetable:
-        try:
-            scrape_timetable(session, db)
-        except Exception as e:
-            log.error("Failed to scrape timetable: %s", e)
+        _backfill_attendance_names(db)
 
     db.close()
     log.info("Refresh complete. DB → %s", DB_PATH)
@@ -473,37 +614,51 @@ def refresh(force: bool = False) -> None:
 #  QUERY HELPERS  (for Thursday to import later)
 # =====================================================================
 
-def get_all_marks() -> list[dict]:
+# One lazily-opened read-only connection serves every helper below, so the
+# per-chat-turn lookups from Thursday Web don't pay a fresh open each time.
+_READ_CONN: sqlite3.Connection | None = None
+_READ_LOCK = threading.Lock()
+
+
+def _get_read_conn() -> sqlite3.Connection:
+    global _READ_CONN
+    if _READ_CONN is None:
+        db = _connect(read_only=True)
+        db.row_factory = sqlite3.Row
+        _READ_CONN = db
+    return _READ_CONN
+
+
+def _query(sql: str, params: tuple = ()) -> list[sqlite3.Row]:
+    with _READ_LOCK:
+        return _get_read_conn().execute(sql, params).fetchall()
+
+
+# Only the columns callers read — skips the id / scraped_at bookkeeping.
+# Rows come back as sqlite3.Row, which supports row["column"] access.
+_MARK_COLS = "subject_code, subject_name, semester, exam_number, max_marks, marks_obtained"
+_ATTENDANCE_COLS = "subject_code, subject_name, classes_attended, classes_total, percentage"
+_TIMETABLE_COLS = "day, period, period_time, subject_code, subject_name, class_type, teacher"
+
+
+def get_all_marks() -> list[sqlite3.Row]:
     """Return all marks from DB."""
-    db = sqlite3.connect(str(DB_PATH))
-    db.row_factory = sqlite3.Row
-    rows = db.execute("SELECT * FROM marks ORDER BY semester, subject_code").fetchall()
-    db.close()
-    return [dict(r) for r in rows]
+    return _query(f"SELECT {_MARK_COLS} FROM marks ORDER BY semester, subject_code")
 
 
-def get_all_attendance() -> list[dict]:
+def get_all_attendance() -> list[sqlite3.Row]:
     """Return all attendance from DB."""
-    db = sqlite3.connect(str(DB_PATH))
-    db.row_factory = sqlite3.Row
-    rows = db.execute("SELECT * FROM attendance ORDER BY subject_code").fetchall()
-    db.close()
-    return [dict(r) for r in rows]
+    return _query(f"SELECT {_ATTENDANCE_COLS} FROM attendance ORDER BY subject_code")
 
 
-def get_timetable(day: str | None = None) -> list[dict]:
+def get_timetable(day: str | None = None) -> list[sqlite3.Row]:
     """Return timetable. Optionally filter by day."""
-    db = sqlite3.connect(str(DB_PATH))
-    db.row_factory = sqlite3.Row
     if day:
-        rows = db.execute(
-            "SELECT * FROM timetable WHERE LOWER(day) = LOWER(?) ORDER BY period",
+        return _query(
+            f"SELECT {_TIMETABLE_COLS} FROM timetable WHERE LOWER(day) = LOWER(?) ORDER BY period",
             (day,),
-        ).fetchall()
-    else:
-        rows = db.execute("SELECT * FROM timetable ORDER BY day, period").fetchall()
-    db.close()
-    return [dict(r) for r in rows]
+        )
+    return _query(f"SELECT {_TIMETABLE_COLS} FROM timetable ORDER BY day, period")
 
 
 def get_subject_summary(subject_query: str) -> dict | None:
@@ -512,37 +667,70 @@ def get_subject_summary(subject_query: str) -> dict | None:
     Returns marks + attendance + timetable slots for that subject.
     Useful for Thursday: "How am I doing in DAA?"
     """
-    db = sqlite3.connect(str(DB_PATH))
-    db.row_factory = sqlite3.Row
     q = f"%{subject_query}%"
 
-    marks = db.execute(
-        "SELECT * FROM marks WHERE subject_code LIKE ? OR subject_name LIKE ?",
+    marks = _query(
+        f"SELECT {_MARK_COLS} FROM marks WHERE subject_code LIKE ? OR subject_name LIKE ?",
         (q, q),
-    ).fetchall()
+    )
 
-    attendance = db.execute(
-        "SELECT * FROM attendance WHERE subject_code LIKE ? OR subject_name LIKE ?",
+    attendance = _query(
+        f"SELECT {_ATTENDANCE_COLS} FROM attendance WHERE subject_code LIKE ? OR subject_name LIKE ?",
         (q, q),
-    ).fetchall()
+    )
 
-    timetable = db.execute(
-        "SELECT * FROM timetable WHERE subject_code LIKE ? OR subject_name LIKE ?",
+    timetable = _query(
+        f"SELECT {_TIMETABLE_COLS} FROM timetable WHERE subject_code LIKE ? OR subject_name LIKE ?",
         (q, q),
-    ).fetchall()
-
-    db.close()
+    )
 
     if not (marks or attendance or timetable):
         return None
 
     return {
-        "marks":      [dict(r) for r in marks],
-        "attendance":  [dict(r) for r in attendance],
-        "timetable":   [dict(r) for r in timetable],
+        "marks":      marks,
+        "attendance":  attendance,
+        "timetable":   timetable,
     }
 
 
+# The whole [COLLEGE DATA] prompt block in one round trip: each line is
+# formatted in SQL and tagged with its section.  Free timetable slots come
+# back with a NULL line so callers can tell "no classes" from "no timetable".
+_TIMETABLE_SLOT_LINE = """
+    CASE WHEN subject_name IS NOT NULL AND subject_name NOT IN ('', 'Free Period')
+         THEN 'P' || period || '(' || period_time || ') ' || subject_name END
+"""
+_CONTEXT_SQL = f"""
+    SELECT tag, line FROM (
+        SELECT 0 AS sec, semester AS k1, subject_code AS k2, 'marks' AS tag,
+               subject_name || ': '
+                   || COALESCE(marks_obtained || '/' || max_marks, 'N/A') AS line
+          FROM marks
+        UNION ALL
+        SELECT 1, subject_code, NULL, 'attendance',
+               COALESCE(subject_name, subject_code) || ': '
+                   || classes_attended || '/' || classes_total || ' (' || percentage || '%)'
+          FROM attendance
+        UNION ALL
+        SELECT 2, period, NULL, 'today', {_TIMETABLE_SLOT_LINE}
+          FROM timetable WHERE LOWER(day) = LOWER(?)
+        UNION ALL
+        SELECT 3, period, NULL, 'tomorrow', {_TIMETABLE_SLOT_LINE}
+          FROM timetable WHERE LOWER(day) = LOWER(?)
+    )
+    ORDER BY sec, k1, k2
+"""
+
+
+def build_context_rows(today: str, tomorrow: str) -> list[sqlite3.Row]:
+    """
+    (tag, line) rows for the prompt context, tags being 'marks',
+    'attendance', 'today' and 'tomorrow', each section in display order.
+    """
+    return _query(_CONTEXT_SQL, (today, tomorrow))
+
+
 def dump_db() -> None:
     """Pretty-print the full DB contents to stdout."""
     print("=" * 60)
@@ -593,6 +781,8 @@ def main():
         return
 
     refresh(force=force)
+    if "--quiet" in sys.argv:
+        return
     print()
     dump_db()
 
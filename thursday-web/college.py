@@ -2,14 +2,16 @@
 College data bridge for Thursday Web.
 
 Imports the scraper module and provides:
-  - background_refresh()  — non-blocking scrape (runs in thread)
+  - background_refresh()  — non-blocking scrape (detached subprocess)
   - get_college_context()  — returns a string block for the system prompt
   - get_subject_detail()   — deep-dive for a specific subject query
 """
 
+import os
 import sys
 import logging
 import threading
+import subprocess
 from pathlib import Path
 from datetime import datetime
 
@@ -26,20 +28,71 @@ log = logging.getLogger("thursday.college")
 
 _refresh_lock = threading.Lock()
 _refreshing = False
+_refresh_proc: subprocess.Popen | None = None
+# The child's log output (login failures, missing credentials, …) lands
+# here, overwritten on each run
+_REFRESH_LOG = Path(_SCRAPER_DIR) / "refresh.log"
 
 
 def background_refresh(force: bool = False) -> None:
     """
-    Kick off a scraper refresh in a background thread.
+    Kick off a scraper refresh in a detached subprocess, so its parse
+    trees and HTTP buffers never live in the web process's heap.
+    Falls back to a background thread if the subprocess can't start.
     Safe to call on every startup — it respects the staleness checks
     and won't hit the network if data is fresh.
     """
-    global _refreshing
+    global _refresh_proc
 
-    if _refreshing:
+    if _refreshing or (_refresh_proc is not None and _refresh_proc.poll() is None):
         log.info("College scraper already running, skipping")
         return
 
+    cmd = [sys.executable, str(Path(_SCRAPER_DIR) / "scraper.py"), "--quiet"]
+    if force:
+        cmd.append("--force")
+    detach = (
+        {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+        if os.name == "nt"
+        else {"start_new_session": True}
+    )
+    try:
+        with open(_REFRESH_LOG, "wb") as err:
+            _refresh_proc = subprocess.Popen(
+                cmd,
+                cwd=_SCRAPER_DIR,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=err,
+                **detach,
+            )
+        log.info("College data refresh started (pid %d)", _refresh_proc.pid)
+        threading.Thread(
+            target=_wait_refresh, args=(_refresh_proc,), daemon=True, name="college-refresh-wait"
+        ).start()
+        return
+    except OSError as e:
+        log.warning("Could not spawn scraper process (%s) — refreshing in-process", e)
+
+    _refresh_in_thread(force)
+
+
+def _wait_refresh(proc: subprocess.Popen) -> None:
+    """Reap the scraper process and report how it went in the web log."""
+    code = proc.wait()
+    if code == 0:
+        log.info("College data refresh complete")
+        return
+    try:
+        lines = _REFRESH_LOG.read_text(encoding="utf-8", errors="replace").strip().splitlines()
+    except OSError:
+        lines = []
+    # The last line is the exception, the same text the in-process refresh logs
+    reason = lines[-1] if lines else f"exit code {code}"
+    log.error("College data refresh failed: %s (see %s)", reason, _REFRESH_LOG)
+
+
+def _refresh_in_thread(force: bool) -> None:
     def _run():
         global _refreshing
         with _refresh_lock:
@@ -62,14 +115,6 @@ def background_refresh(force: bool = False) -> None:
 _DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
 
 
-def _today_name() -> str:
-    return _DAY_NAMES[datetime.now().weekday()]
-
-
-def _tomorrow_name() -> str:
-    return _DAY_NAMES[(datetime.now().weekday() + 1) % 7]
-
-
 # ── Context builder ─────────────────────────────────────────────────
 
 def get_college_context() -> str:
@@ -82,48 +127,41 @@ def get_college_context() -> str:
     if not scraper.DB_PATH.exists():
         return ""
 
+    # One clock read for both days, so they can't straddle midnight
+    today_idx = datetime.now().weekday()
+    today = _DAY_NAMES[today_idx]
+    tomorrow = _DAY_NAMES[(today_idx + 1) % 7]
+
+    # One query returns every line pre-formatted, tagged by section
+    sections: dict[str, list[str | None]] = {}
+    for tag, line in scraper.build_context_rows(today, tomorrow):
+        sections.setdefault(tag, []).append(line)
+
     parts: list[str] = []
     parts.append("[COLLEGE DATA]")
 
     # ── Marks (compact) ──────────────────────────────────────────────
-    marks = scraper.get_all_marks()
-    if marks:
+    # Use short name, skip semester/exam since there's only one
+    if "marks" in sections:
         parts.append("Marks (Sessional):")
-        for m in marks:
-            obtained = m["marks_obtained"]
-            pct = f"{obtained}/{m['max_marks']}" if obtained is not None else "N/A"
-            # Use short name, skip semester/exam since there's only one
-            parts.append(f"  {m['subject_name']}: {pct}")
+        parts.extend(f"  {line}" for line in sections["marks"])
 
     # ── Attendance (compact) ─────────────────────────────────────────
-    attendance = scraper.get_all_attendance()
-    if attendance:
+    if "attendance" in sections:
         parts.append("Attendance:")
-        for a in attendance:
-            name = a["subject_name"] or a["subject_code"]
-            parts.append(f"  {name}: {a['classes_attended']}/{a['classes_total']} ({a['percentage']}%)")
-
-    # ── Today's timetable (skip free periods) ────────────────────────
-    today = _today_name()
-    today_tt = scraper.get_timetable(day=today)
-    if today_tt:
-        slots = []
-        for t in today_tt:
-            if t["subject_name"] and t["subject_name"] != "Free Period":
-                slots.append(f"P{t['period']}({t['period_time']}) {t['subject_name']}")
+        parts.extend(f"  {line}" for line in sections["attendance"])
+
+    # ── Today's timetable (free periods come back as None) ───────────
+    if "today" in sections:
+        slots = [line for line in sections["today"] if line]
         if slots:
             parts.append(f"Today ({today}): " + ", ".join(slots))
         else:
             parts.append(f"Today ({today}): No classes")
 
-    # ── Tomorrow's timetable (skip free periods) ─────────────────────
-    tomorrow = _tomorrow_name()
-    tomorrow_tt = scraper.get_timetable(day=tomorrow)
-    if tomorrow_tt:
-        slots = []
-        for t in tomorrow_tt:
-            if t["subject_name"] and t["subject_name"] != "Free Period":
-                slots.append(f"P{t['period']}({t['period_time']}) {t['subject_name']}")
+    # ── Tomorrow's timetable (free periods come back as None) ────────
+    if "tomorrow" in sections:
+        slots = [line for line in sections["tomorrow"] if line]
         if slots:
             parts.append(f"Tomorrow ({tomorrow}): " + ", ".join(slots))
 
@@ -162,7 +200,7 @@ def get_subject_detail(query: str) -> str | None:
         parts.append("Schedule:")
         for t in result["timetable"]:
             if t["subject_name"] and t["subject_name"] != "Free Period":
-                ctype = f" [{t['class_type']}]" if t.get("class_type") else ""
+                ctype = f" [{t['class_type']}]" if t["class_type"] else ""
                 parts.append(f"  {t['day']} P{t['period']} ({t['period_time']}){ctype}")
 
     return "\n".join(parts) if parts else None
@@ -59,7 +59,7 @@ MEMORY_TRIGGER_PREFIXES = [
 # --- Discord / Reminders ---
 DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL", "")
 DISCORD_USER_ID = os.getenv("DISCORD_USER_ID", "")
-REMINDER_CHECK_INTERVAL = 10  # seconds between due-reminder checks
+REMINDER_MAX_WAIT = 60  # longest the reminder loop sleeps without re-checking
 
 # --- Twilio / WhatsApp ---
 TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID", "")
@@ -1,42 +1,140 @@
 """
 HTTP client for llama-server.
 
-Provides both streaming (generator-based) and blocking calls.
+Provides both streaming (async generator) and blocking calls.
 Used by the FastAPI proxy for both raw and Thursday modes.
 
-All JSON SSE chunks are re-serialised with ensure_ascii=True so
-that emoji / non-ASCII content becomes \\uXXXX escapes.  This
-guarantees the stream is pure ASCII and cannot be garbled by any
-intermediate encoding layer (requests, uvicorn, or the browser).
+Streaming goes through an httpx.AsyncClient so StreamingResponse can
+consume it on the event loop directly, with no threadpool hop per
+chunk.  The non-streaming call has an async form (achat, used by
+WhatsApp) and a sync one on an httpx.Client, as has the health check.
+
+Streaming calls are a bytewise pass-through: each line llama-server
+sends is re-framed and yielded as the same UTF-8 bytes, with no JSON
+decode/encode in between.  Only Thursday mode parses the payload, and
+only to collect tokens for memory.
 """
 
-import json
-from typing import Generator
+import socket
+from functools import lru_cache
+from typing import AsyncGenerator, AsyncIterator
 
-import requests
+import httpx
+import orjson
 
 from config import LLAMA_CHAT_ENDPOINT, MAX_TOKENS, MODEL_NAME, TEMPERATURE, TOP_P
 
 
-def _reencode_sse_line(raw_line: bytes) -> str:
-    """Take a raw SSE bytes line from llama-server and return a
-    pure-ASCII SSE string (with \\n\\n appended).
+def _frame(line: bytes | dict) -> bytes:
+    """Frame an SSE event for the browser.
+
+    Raw lines from llama-server are passed through untouched; a dict is
+    serialised once with orjson as a ``data:`` payload.
+    """
+    if isinstance(line, dict):
+        return b"data: " + orjson.dumps(line) + b"\n\n"
+    return line + b"\n\n"
+
+
+def _make_error_chunk(message: str) -> dict:
+    """Build a fake SSE chunk carrying an error message."""
+    return {
+        "choices": [
+            {
+                "index": 0,
+                "delta": {"content": f"[Error: {message}]"},
+                "finish_reason": "stop",
+            }
+        ]
+    }
+
+
+def _error_frames(message: str) -> bytes:
+    """Error chunk + [DONE], ready to yield as a single write."""
+    return _frame(_make_error_chunk(message)) + _DONE_FRAME
+
+
+_DONE_FRAME = b"data: [DONE]\n\n"
+# Built once at import so the failure paths yield without serialising
+_CONN_ERR_FRAME = _error_frames("Cannot reach llama-server. Is it running?")
+_TIMEOUT_FRAME = _error_frames("Request timed out.")
+
+
+@lru_cache(maxsize=32)
+def _http_err_frame(status: int) -> bytes:
+    return _error_frames(f"HTTP {status}")
+
+
+# Everything but messages/temperature/max_tokens is fixed per process, so
+# the request body is spliced together from a pre-serialised prefix.
+# cache_prompt asks llama-server to keep the KV cache of the shared
+# prompt prefix (system message + earlier turns) between requests.
+_BODY_PREFIX = {
+    stream: b'{"model":' + orjson.dumps(MODEL_NAME)
+    + b',"top_p":' + orjson.dumps(TOP_P)
+    + b',"stream":' + orjson.dumps(stream)
+    + b',"cache_prompt":true'
+    for stream in (True, False)
+}
+
+
+def _chat_body(messages: list[dict], temperature: float, max_tokens: int, stream: bool) -> bytes:
+    return (
+        _BODY_PREFIX[stream]
+        + b',"temperature":' + orjson.dumps(temperature)
+        + b',"max_tokens":' + orjson.dumps(max_tokens)
+        + b',"messages":' + orjson.dumps(messages)
+        + b"}"
+    )
+
+
+_OFFLINE_REPLY = "\u26a0\ufe0f I'm currently offline. Please try again later."
+_TIMEOUT_REPLY = "\u26a0\ufe0f Taking too long — try again in a moment."
+
+
+def _reply_text(content: bytes) -> str:
+    """The assistant text from a non-streaming completion body."""
+    return orjson.loads(content)["choices"][0]["message"]["content"].strip()
+
+
+async def _aiter_lines(resp: httpx.Response) -> AsyncIterator[bytes]:
+    """Split a streamed body into lines, as bytes (httpx's own
+    aiter_lines decodes to str).
+
+    Lines are sliced off a bytearray at an advancing ``start`` cursor
+    instead of re-slicing the buffer per line; consumed bytes are only
+    dropped once they make up over half of it.
+    """
+    buf = bytearray()
+    start = 0
+    async for chunk in resp.aiter_bytes():
+        buf += chunk
+        while (nl := buf.find(b"\n", start)) != -1:
+            end = nl - 1 if nl > start and buf[nl - 1] == 0x0D else nl  # drop \r
+            yield bytes(memoryview(buf)[start:end])  # the one copy per line
+            start = nl + 1
+        if start > len(buf) // 2:
+            del buf[:start]
+            start = 0
+    if start < len(buf):
+        yield bytes(memoryview(buf)[start:]).rstrip(b"\r")
+
+
+class CollectedReply:
+    """A streamed reply accumulated as UTF-8 bytes, plus its token count.
 
-    If the line is a JSON data payload, re-serialise it with
-    ensure_ascii=True so every non-ASCII codepoint is escaped.
-    Non-data lines are passed through as-is.
+    One growing buffer instead of a list of per-token strings; it is
+    decoded once, by text(), when the stream is over.
     """
-    text = raw_line.decode("utf-8", errors="replace")
-    if text.startswith("data: "):
-        payload = text[6:].strip()
-        if payload and payload != "[DONE]":
-            try:
-                obj = json.loads(payload)
-                payload = json.dumps(obj, ensure_ascii=True)
-                return f"data: {payload}\n\n"
-            except (json.JSONDecodeError, ValueError):
-                pass
-    return f"{text}\n\n"
+
+    __slots__ = ("buf", "tokens")
+
+    def __init__(self) -> None:
+        self.buf = bytearray()
+        self.tokens = 0
+
+    def text(self) -> str:
+        return self.buf.decode("utf-8")
 
 
 class LlamaClient:
@@ -48,130 +146,138 @@ class LlamaClient:
         timeout: float = 120.0,
     ) -> None:
         self._endpoint = endpoint
+        self._health_url = endpoint.replace("/v1/chat/completions", "/health")
         self._timeout = timeout
-        self._session = requests.Session()
-        self._session.headers.update({"Content-Type": "application/json"})
+        # llama-server is plain HTTP on localhost, so HTTP/2 (which httpx
+        # only negotiates over TLS) would not apply; keep-alive 1.1 it is.
+        headers = {"Content-Type": "application/json"}
+        # Enough idle connections that web + WhatsApp traffic never has to
+        # reconnect, and TCP_NODELAY so small SSE writes aren't held back
+        # by Nagle's algorithm.
+        limits = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        socket_options = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            headers=headers,
+            transport=httpx.AsyncHTTPTransport(limits=limits, socket_options=socket_options),
+        )
+        self._sync_client = httpx.Client(
+            timeout=timeout,
+            headers=headers,
+            transport=httpx.HTTPTransport(limits=limits, socket_options=socket_options),
+        )
 
     def health_check(self) -> bool:
         try:
-            r = self._session.get(
-                self._endpoint.replace("/v1/chat/completions", "/health"),
-                timeout=5,
-            )
+            r = self._sync_client.get(self._health_url, timeout=5)
             return r.status_code == 200
-        except requests.ConnectionError:
+        except httpx.TransportError:
+            return False
+
+    async def ahealth_check(self) -> bool:
+        """health_check() for the event loop, on the async client."""
+        try:
+            r = await self._client.get(self._health_url, timeout=5)
+            return r.status_code == 200
+        except httpx.TransportError:
             return False
 
     # ----------------------------------------------------------------
-    # Raw mode — proxy SSE with ASCII-safe re-encoding
+    # Raw mode — proxy SSE frames as bytes
     # ----------------------------------------------------------------
 
-    def stream_chat(
+    async def stream_chat(
         self,
         messages: list[dict],
         temperature: float = TEMPERATURE,
         max_tokens: int = MAX_TOKENS,
-    ) -> Generator[str, None, None]:
-        """Yield SSE strings (pure-ASCII) from llama-server."""
-        payload = {
-            "model": MODEL_NAME,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-            "top_p": TOP_P,
-            "stream": True,
-        }
+    ) -> AsyncGenerator[bytes, None]:
+        """Yield SSE frames (UTF-8 bytes) from llama-server."""
+        body = _chat_body(messages, temperature, max_tokens, stream=True)
 
         try:
-            resp = self._session.post(
-                self._endpoint,
-                json=payload,
-                stream=True,
-                timeout=self._timeout,
-            )
-            resp.raise_for_status()
+            async with self._client.stream("POST", self._endpoint, content=body) as resp:
+                resp.raise_for_status()
+
+                async for raw_line in _aiter_lines(resp):
+                    if not raw_line:
+                        yield b"\n"
+                        continue
+                    yield _frame(raw_line)
+                    if raw_line.startswith(b"data: ") and raw_line[6:].strip() == b"[DONE]":
+                        break
 
-            for raw_line in resp.iter_lines():
-                if not raw_line:
-                    yield "\n"
-                    continue
-                sse = _reencode_sse_line(raw_line)
-                yield sse
-                if raw_line.startswith(b"data: ") and raw_line[6:].strip() == b"[DONE]":
-                    break
-
-        except requests.ConnectionError:
-            yield f"data: {json.dumps(_make_error_chunk('Cannot reach llama-server. Is it running?'))}\n\n"
-            yield "data: [DONE]\n\n"
-        except requests.Timeout:
-            yield f"data: {json.dumps(_make_error_chunk('Request timed out.'))}\n\n"
-            yield "data: [DONE]\n\n"
-        except requests.HTTPError as e:
-            yield f"data: {json.dumps(_make_error_chunk(f'HTTP {e.response.status_code}'))}\n\n"
-            yield "data: [DONE]\n\n"
+        except httpx.ConnectError:
+            yield _CONN_ERR_FRAME
+        except httpx.TimeoutException:
+            yield _TIMEOUT_FRAME
+        except httpx.HTTPStatusError as e:
+            yield _http_err_frame(e.response.status_code)
 
     # ----------------------------------------------------------------
     # Thursday mode — proxy SSE + collect tokens for memory
     # ----------------------------------------------------------------
 
-    def stream_chat_and_collect(
+    async def stream_chat_and_collect(
         self,
         messages: list[dict],
         temperature: float = TEMPERATURE,
         max_tokens: int = MAX_TOKENS,
-    ) -> Generator[tuple[str, list[str]], None, None]:
-        """Yield (sse_string, collected_tokens) tuples.
-        SSE data is pure ASCII (ensure_ascii).
-        Tokens are full-Unicode strings kept for memory storage.
+    ) -> AsyncGenerator[tuple[bytes, CollectedReply], None]:
+        """Yield (sse_frame, collected) tuples.
+        SSE frames are UTF-8 bytes.
+        collected is the same CollectedReply throughout, holding the
+        reply so far for memory storage.
         """
-        collected: list[str] = []
-        payload = {
-            "model": MODEL_NAME,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-            "top_p": TOP_P,
-            "stream": True,
-        }
+        collected = CollectedReply()
+        buf = collected.buf
+        body = _chat_body(messages, temperature, max_tokens, stream=True)
 
         try:
-            resp = self._session.post(
-                self._endpoint,
-                json=payload,
-                stream=True,
-                timeout=self._timeout,
-            )
-            resp.raise_for_status()
+            async with self._client.stream("POST", self._endpoint, content=body) as resp:
+                resp.raise_for_status()
 
-            for raw_line in resp.iter_lines():
-                if not raw_line:
-                    yield "\n", collected
-                    continue
+                # Bound once: this loop runs per token
+                extend = buf.extend
+                loads = orjson.loads
+                frame = _frame
 
-                # Parse token for collection (full Unicode)
-                if raw_line.startswith(b"data: "):
-                    data_bytes = raw_line[6:]
-                    if data_bytes.strip() == b"[DONE]":
-                        yield "data: [DONE]\n\n", collected
-                        break
-                    try:
-                        chunk = json.loads(data_bytes)
-                        delta = chunk.get("choices", [{}])[0].get("delta", {})
-                        token = delta.get("content", "")
-                        if token:
-                            collected.append(token)
-                    except (json.JSONDecodeError, KeyError, IndexError):
-                        pass
-
-                # Yield the ASCII-safe SSE line
-                yield _reencode_sse_line(raw_line), collected
-
-        except requests.ConnectionError:
-            yield f"data: {json.dumps(_make_error_chunk('Cannot reach llama-server.'))}\n\n", collected
-            yield "data: [DONE]\n\n", collected
-        except requests.Timeout:
-            yield f"data: {json.dumps(_make_error_chunk('Request timed out.'))}\n\n", collected
-            yield "data: [DONE]\n\n", collected
+                async for raw_line in _aiter_lines(resp):
+                    if not raw_line:
+                        yield b"\n", collected
+                        continue
+
+                    # Parse token for collection (full Unicode) — the only
+                    # parse of this payload; the frame below reuses the bytes
+                    if raw_line.startswith(b"data: "):
+                        data_bytes = raw_line[6:].strip()
+                        if data_bytes == b"[DONE]":
+                            yield _DONE_FRAME, collected
+                            break
+                        # A chunk is always one JSON object; anything that
+                        # doesn't end in "}" would only fail to parse, and
+                        # one without a "content" key (role/finish chunks)
+                        # has no token to collect
+                        if data_bytes.endswith(b"}") and b'"content"' in data_bytes:
+                            try:
+                                chunk = loads(data_bytes)
+                                delta = chunk.get("choices", [{}])[0].get("delta", {})
+                                token = delta.get("content", "")
+                                if token:
+                                    extend(token.encode("utf-8"))
+                                    collected.tokens += 1
+                            except (orjson.JSONDecodeError, KeyError, IndexError):
+                                pass
+
+                    # Pass the original bytes through
+                    yield frame(raw_line), collected
+
+        except httpx.ConnectError:
+            yield _CONN_ERR_FRAME, collected
+        except httpx.TimeoutException:
+            yield _TIMEOUT_FRAME, collected
+        except httpx.HTTPStatusError as e:
+            yield _http_err_frame(e.response.status_code), collected
 
     def blocking_chat(
         self,
@@ -184,40 +290,38 @@ class LlamaClient:
         Used by the WhatsApp webhook where we need the complete response
         before replying.
         """
-        payload = {
-            "model": MODEL_NAME,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-            "top_p": TOP_P,
-            "stream": False,
-        }
+        body = _chat_body(messages, temperature, max_tokens, stream=False)
         try:
-            resp = self._session.post(
-                self._endpoint, json=payload, timeout=self._timeout
-            )
+            resp = self._sync_client.post(self._endpoint, content=body)
             resp.raise_for_status()
-            data = resp.json()
-            return data["choices"][0]["message"]["content"].strip()
-        except requests.ConnectionError:
-            return "\u26a0\ufe0f I'm currently offline. Please try again later."
-        except requests.Timeout:
-            return "\u26a0\ufe0f Taking too long — try again in a moment."
+            return _reply_text(resp.content)
+        except httpx.ConnectError:
+            return _OFFLINE_REPLY
+        except httpx.TimeoutException:
+            return _TIMEOUT_REPLY
         except Exception as exc:
             return f"\u26a0\ufe0f Something went wrong: {exc}"
 
-    def close(self) -> None:
-        self._session.close()
-
+    async def achat(
+        self,
+        messages: list[dict],
+        temperature: float = TEMPERATURE,
+        max_tokens: int = MAX_TOKENS,
+    ) -> str:
+        """blocking_chat() on the async client, so the wait for the full
+        reply holds no worker thread."""
+        body = _chat_body(messages, temperature, max_tokens, stream=False)
+        try:
+            resp = await self._client.post(self._endpoint, content=body)
+            resp.raise_for_status()
+            return _reply_text(resp.content)
+        except httpx.ConnectError:
+            return _OFFLINE_REPLY
+        except httpx.TimeoutException:
+            return _TIMEOUT_REPLY
+        except Exception as exc:
+            return f"\u26a0\ufe0f Something went wrong: {exc}"
 
-def _make_error_chunk(message: str) -> dict:
-    """Build a fake SSE chunk carrying an error message."""
-    return {
-        "choices": [
-            {
-                "index": 0,
-                "delta": {"content": f"[Error: {message}]"},
-                "finish_reason": "stop",
-            }
-        ]
-    }
+    async def aclose(self) -> None:
+        await self._client.aclose()
+        self._sync_client.close()
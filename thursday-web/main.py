@@ -24,45 +24,63 @@ Architecture:
 import json
 import sys
 import os
+import atexit
 import asyncio
+import gzip
+import hashlib
 import logging
+import queue
 import time as _time
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import AsyncGenerator
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from fastapi import BackgroundTasks, FastAPI, Form, Response
-from fastapi.responses import StreamingResponse, JSONResponse, FileResponse
+from fastapi import BackgroundTasks, FastAPI, Form, Request, Response
+from fastapi.responses import StreamingResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+import orjson
 from pydantic import BaseModel
 
-from config import PROXY_HOST, PROXY_PORT, REMINDER_CHECK_INTERVAL, DB_FILE
+from config import PROXY_HOST, PROXY_PORT, REMINDER_MAX_WAIT, SHORT_TERM_LIMIT, DB_FILE
 from llama_client import LlamaClient
 from memory import MemoryStore
 from personality import Personality
 from reminder import (
     ReminderStore,
-    extract_reminder_tags,
-    strip_reminder_tags,
+    split_reminder_tags,
     parse_time_expression,
-    send_reminder_set_notification,
-    send_reminder_fire_notification,
+    queue_reminder_set_notification,
+    send_reminder_fire_notification_async,
     get_current_time_string,
+    format_trigger_time,
     try_parse_user_reminder,
 )
 from college import background_refresh as college_refresh, get_college_context
+from notifier import aclose as close_notifier
 
 
 # ------------------------------------------------------------------
 # Logging setup
 # ------------------------------------------------------------------
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s  %(message)s",
-    datefmt="%H:%M:%S",
-)
+# Records are only queued on the calling thread (event loop included);
+# formatting and the stderr write happen on the listener's thread.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s  %(message)s", datefmt="%H:%M:%S"))
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+# force: the scraper (imported via college) has already configured the root logger
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler], force=True)
+_log_listener = QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 # Suppress noisy uvicorn access logs for /health
 logging.getLogger("uvicorn.access").addFilter(
     type("HealthFilter", (logging.Filter,), {
@@ -82,31 +100,55 @@ memory: MemoryStore
 personality: Personality
 reminders: ReminderStore
 _reminder_task: asyncio.Task | None = None
+_reminder_wake: asyncio.Event
 
 
 async def _reminder_check_loop():
-    """Background loop: check for due reminders every N seconds."""
+    """Background loop: sleep until the next reminder is due, then fire it.
+
+    Adding or deleting a reminder sets _reminder_wake so the sleep is
+    re-planned.  With nothing pending it waits on the event alone, so an
+    idle server runs no queries; otherwise REMINDER_MAX_WAIT caps the
+    sleep against wall-clock jumps.
+    """
     while True:
         try:
-            await asyncio.sleep(REMINDER_CHECK_INTERVAL)
-            due = reminders.get_due_reminders()
-            for r in due:
-                log.info("⏰  Reminder #%d fired: %s", r.id, r.message)
-                send_reminder_fire_notification(r.message)
-                reminders.mark_fired(r.id)
+            # Clear before reading, so a reminder added in between still wakes us
+            _reminder_wake.clear()
+            next_at = reminders.get_next_trigger_at()
+            now = _time.time()
+            if next_at is not None and next_at <= now:
+                due = reminders.get_due_reminders()
+                for r in due:
+                    log.info("⏰  Reminder #%d fired: %s", r.id, r.message)
+                await asyncio.gather(
+                    *(send_reminder_fire_notification_async(r.message) for r in due)
+                )
+                reminders.mark_fired_many([r.id for r in due])
+                continue
+            timeout = None if next_at is None else min(REMINDER_MAX_WAIT, next_at - now)
+            try:
+                await asyncio.wait_for(_reminder_wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
         except asyncio.CancelledError:
             break
         except Exception as e:
             log.error("Reminder loop error: %s", e)
+            await asyncio.sleep(1)  # don't spin if the DB keeps failing
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global llama, memory, personality, reminders, _reminder_task
+    global llama, memory, personality, reminders, _reminder_task, _reminder_wake
     llama = LlamaClient()
     memory = MemoryStore()
     personality = Personality()
     reminders = ReminderStore(str(DB_FILE))
+    # Reminders are added from worker threads too (WhatsApp, reply saving)
+    loop = asyncio.get_running_loop()
+    _reminder_wake = asyncio.Event()
+    reminders.on_change = lambda: loop.call_soon_threadsafe(_reminder_wake.set)
     log.info("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
     log.info("  Thursday Web starting on http://localhost:%d", PROXY_PORT)
     log.info("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
@@ -116,7 +158,7 @@ async def lifespan(app: FastAPI):
         log.warning("✗  LLM server not reachable — start it first")
 
     _reminder_task = asyncio.create_task(_reminder_check_loop())
-    log.info("✓  Reminder checker started (every %ds)", REMINDER_CHECK_INTERVAL)
+    log.info("✓  Reminder checker started")
 
     # Kick off college data refresh in background thread
     college_refresh()
@@ -131,12 +173,26 @@ async def lifespan(app: FastAPI):
             await _reminder_task
         except asyncio.CancelledError:
             pass
+    reminders.on_change = None
     reminders.close()
-    llama.close()
+    await llama.aclose()
+    await close_notifier()
     memory.close()
 
 
-app = FastAPI(title="Thursday Web", version="2.0.0", lifespan=lifespan)
+class ORJSONResponse(JSONResponse):
+    """JSONResponse serialised by orjson, straight to bytes."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+app = FastAPI(
+    title="Thursday Web",
+    version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -150,19 +206,49 @@ app.add_middleware(
 # Request models
 # ------------------------------------------------------------------
 
-class ChatMessage(BaseModel):
-    role: str
-    content: str
+@dataclass(slots=True)
+class ChatRequest:
+    """Body of /v1/chat/completions.
 
+    Parsed straight from the raw bytes with orjson rather than through
+    pydantic: this is the hot endpoint, and the messages only need to be
+    checked and handed on.
+    """
 
-class ChatRequest(BaseModel):
-    messages: list[ChatMessage]
+    messages: list[dict]
     mode: str = "raw"
     conversation_id: str | None = None
     temperature: float = 0.7
     max_tokens: int = 512
     stream: bool = True
 
+    @classmethod
+    def from_json(cls, body: bytes) -> "ChatRequest":
+        """Raises ValueError (orjson.JSONDecodeError included) on a bad body."""
+        data = orjson.loads(body)
+        if not isinstance(data, dict) or not isinstance(data.get("messages"), list):
+            raise ValueError("'messages' must be a list")
+        messages = []
+        for m in data["messages"]:
+            if not (isinstance(m, dict) and isinstance(m.get("role"), str)
+                    and isinstance(m.get("content"), str)):
+                raise ValueError("each message needs string 'role' and 'content'")
+            messages.append({"role": m["role"], "content": m["content"]})
+        conv_id = data.get("conversation_id")
+        if conv_id is not None and not isinstance(conv_id, str):
+            raise ValueError("'conversation_id' must be a string")
+        try:
+            return cls(
+                messages=messages,
+                mode=str(data.get("mode", "raw")),
+                conversation_id=conv_id,
+                temperature=float(data.get("temperature", 0.7)),
+                max_tokens=int(data.get("max_tokens", 512)),
+                stream=bool(data.get("stream", True)),
+            )
+        except (TypeError, ValueError) as e:
+            raise ValueError(str(e)) from None
+
 
 class RenameRequest(BaseModel):
     title: str
@@ -173,8 +259,12 @@ class RenameRequest(BaseModel):
 # ------------------------------------------------------------------
 
 @app.post("/v1/chat/completions")
-async def chat_completions(req: ChatRequest):
-    messages = [m.model_dump() for m in req.messages]
+async def chat_completions(request: Request):
+    try:
+        req = ChatRequest.from_json(await request.body())
+    except ValueError as e:
+        return ORJSONResponse({"detail": str(e)}, status_code=422)
+    messages = req.messages
 
     if req.mode == "thursday":
         return _thursday_stream(messages, req.temperature, req.max_tokens, req.conversation_id)
@@ -182,12 +272,80 @@ async def chat_completions(req: ChatRequest):
         return _raw_stream(messages, req.temperature, req.max_tokens)
 
 
+# SSE frames arriving within this window of the last write go out together
+_COALESCE_WINDOW = 0.020  # seconds
+_COALESCE_MAX_BYTES = 4096
+_DONE_SUFFIX = b"data: [DONE]\n\n"
+
+
+async def _coalesce(frames: AsyncGenerator[bytes, None]) -> AsyncGenerator[bytes, None]:
+    """Batch SSE frames into fewer, larger writes.
+
+    A frame that arrives after a quiet spell is passed on at once (so
+    the first token isn't delayed); frames that follow within
+    _COALESCE_WINDOW are buffered and written together when the window
+    closes, the buffer reaches _COALESCE_MAX_BYTES, or [DONE] arrives.
+    """
+    loop = asyncio.get_running_loop()
+    buf = bytearray()
+    last_write = float("-inf")
+    pending: asyncio.Future | None = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(frames.__anext__())
+            if buf:
+                # Wait out the rest of the window, but leave the read
+                # running if it expires: cancelling it would cancel the
+                # upstream stream read half-way.
+                timeout = max(0.0, last_write + _COALESCE_WINDOW - loop.time())
+                done, _ = await asyncio.wait((pending,), timeout=timeout)
+                if not done:
+                    yield bytes(buf)
+                    buf.clear()
+                    last_write = loop.time()
+                    continue
+            try:
+                frame = await pending
+            except StopAsyncIteration:
+                break
+            pending = None
+
+            now = loop.time()
+            if not buf and now - last_write >= _COALESCE_WINDOW:
+                yield frame
+                last_write = now
+                continue
+            buf += frame
+            if len(buf) >= _COALESCE_MAX_BYTES or frame.endswith(_DONE_SUFFIX):
+                yield bytes(buf)
+                buf.clear()
+                last_write = loop.time()
+        if buf:
+            yield bytes(buf)
+    finally:
+        # Client went away mid-read: stop the read before closing upstream
+        if pending is not None and not pending.done():
+            pending.cancel()
+            try:
+                await pending
+            except BaseException:
+                pass
+        await frames.aclose()
+
+
 def _raw_stream(
     messages: list[dict], temperature: float, max_tokens: int
 ) -> StreamingResponse:
-    def generate():
-        yield from llama.stream_chat(messages, temperature, max_tokens)
-    return StreamingResponse(generate(), media_type="text/event-stream")
+    async def generate():
+        async for frame in llama.stream_chat(messages, temperature, max_tokens):
+            yield frame
+    return StreamingResponse(_coalesce(generate()), media_type="text/event-stream; charset=utf-8")
+
+
+def _log_prompt_save_error(task: asyncio.Task) -> None:
+    if not task.cancelled() and (e := task.exception()) is not None:
+        log.error("Saving web prompt failed: %s", e)
 
 
 def _thursday_stream(
@@ -212,36 +370,41 @@ def _thursday_stream(
         if trigger_at:
             reminder_created = reminders.add_reminder(reminder_message, trigger_at, conv_id)
             log.info("   ⏰ Reminder set: '%s' → fires in %.0fs", reminder_message, trigger_at - _time.time())
-            send_reminder_set_notification(reminder_message, trigger_at)
-
-    # Step 3: save user message
-    memory.add_message("user", user_msg, conv_id)
-
-    # Auto-title if first message in conversation
-    if conv_id and memory.get_conversation_message_count(conv_id) == 1:
-        memory.auto_title_conversation(conv_id, user_msg)
 
-    # Step 4: build augmented messages (includes reminder context)
-    augmented = _build_thursday_messages(conv_id, reminder_just_set=reminder_created)
+    # Step 3: build augmented messages (includes reminder context), with
+    # the user message appended to history ahead of it being saved
+    augmented = _build_thursday_messages(
+        conv_id, reminder_just_set=reminder_created, pending_user_msg=user_msg
+    )
 
-    collected_tokens: list[str] = []
+    # Step 4: saving the user message, auto-titling and the reminder
+    # notification don't feed the prompt, so they run on a worker thread
+    # while llama-server starts generating
+    pre_writes = asyncio.create_task(
+        asyncio.to_thread(_save_thursday_prompt, user_msg, conv_id, reminder_created)
+    )
+    # Logged from the task itself: if the client drops mid-stream,
+    # generate() is closed at a yield and never gets to await it
+    pre_writes.add_done_callback(_log_prompt_save_error)
 
-    def generate():
-        nonlocal collected_tokens
-        for sse_line, tokens in llama.stream_chat_and_collect(
+    async def generate():
+        collected = None
+        async for sse_line, collected in llama.stream_chat_and_collect(
             augmented, temperature, max_tokens
         ):
-            collected_tokens = tokens
             yield sse_line
 
-        full_reply = "".join(collected_tokens)
+        # The reply must land after the user message it answers (a failure
+        # was already logged by the done callback)
+        await asyncio.wait((pre_writes,))
+
+        full_reply = collected.text() if collected else ""
         if full_reply:
-            _process_reminders(full_reply, conv_id)
-            clean_reply = strip_reminder_tags(full_reply)
-            memory.add_message("assistant", clean_reply, conv_id)
+            # DB writes + notifications block, so keep them off the event loop
+            await asyncio.to_thread(_save_thursday_reply, full_reply, conv_id)
 
         elapsed = _time.time() - t0
-        token_count = len(collected_tokens)
+        token_count = collected.tokens if collected else 0
         reply_chars = len(full_reply) if full_reply else 0
         tps = token_count / elapsed if elapsed > 0 else 0
         log.info(
@@ -249,28 +412,100 @@ def _thursday_stream(
             token_count, reply_chars, elapsed, tps,
         )
 
-    return StreamingResponse(generate(), media_type="text/event-stream")
+    return StreamingResponse(_coalesce(generate()), media_type="text/event-stream; charset=utf-8")
 
 
-def _process_reminders(full_reply: str, conversation_id: str | None) -> None:
-    """Extract [REMIND: ...] tags from the AI reply and create reminders."""
-    tags = extract_reminder_tags(full_reply)
+# Conversations already past their first message (so already auto-titled,
+# or never will be).  Forgotten when their history is deleted.
+_auto_titled_convs: set[str] = set()
+
+
+def _save_thursday_prompt(
+    user_msg: str, conversation_id: str | None, reminder_created: object | None
+) -> None:
+    """Store the user message (auto-titling a new conversation) and send
+    the notification for any reminder it created."""
+    if reminder_created:
+        queue_reminder_set_notification(reminder_created.message, reminder_created.trigger_at)
+    memory.add_message("user", user_msg, conversation_id)
+    # Auto-title if first message in conversation; past that, the set
+    # answers without a query
+    if conversation_id and conversation_id not in _auto_titled_convs:
+        if memory.is_first_message(conversation_id):
+            memory.auto_title_conversation(conversation_id, user_msg)
+        _auto_titled_convs.add(conversation_id)
+
+
+def _save_thursday_reply(full_reply: str, conversation_id: str | None) -> None:
+    """Create any tagged reminders, then store the cleaned reply."""
+    clean_reply = _process_reminders(full_reply, conversation_id)
+    memory.add_message("assistant", clean_reply, conversation_id)
+
+
+def _process_reminders(full_reply: str, conversation_id: str | None) -> str:
+    """Extract [REMIND: ...] tags from the AI reply and create reminders.
+
+    Returns the reply with the tags removed.
+    """
+    clean_reply, tags = split_reminder_tags(full_reply)
+    parsed = []
     for full_match, time_expr, message in tags:
         trigger_at = parse_time_expression(time_expr)
         if trigger_at is None:
             log.warning("   Could not parse reminder time: '%s'", time_expr)
             continue
-        reminder = reminders.add_reminder(message, trigger_at, conversation_id)
-        log.info("   ⏰ Reminder #%d set: '%s'", reminder.id, message)
-        send_reminder_set_notification(message, trigger_at)
+        parsed.append((message, trigger_at))
+    if not parsed:
+        return clean_reply
+    # One transaction for every tag in the reply
+    for reminder in reminders.add_many(parsed, conversation_id):
+        log.info("   ⏰ Reminder #%d set: '%s'", reminder.id, reminder.message)
+        queue_reminder_set_notification(reminder.message, reminder.trigger_at)
+    return clean_reply
+
+
+class _SystemPromptCache:
+    """The system prompt, minus the reminder-just-set note, rebuilt only
+    when one of its inputs has moved.
+
+    The key is the personality/facts/reminders store versions (each store
+    bumps its counter on write), the clock minute (the time line has
+    minute resolution) and the college block itself: that DB is written
+    by the scraper process, so there is no counter to watch and the
+    rendered text is compared instead.
+    """
 
+    def __init__(self) -> None:
+        # (key, prompt) swapped as one tuple, so a WhatsApp worker thread
+        # never sees a new key paired with an old prompt
+        self._entry: tuple[tuple, str] | None = None
+
+    def get(self, college_ctx: str) -> str:
+        key = (
+            personality.version,
+            memory.facts_version,
+            reminders.version,
+            int(_time.time() // 60),
+            college_ctx,
+        )
+        entry = self._entry
+        if entry is None or entry[0] != key:
+            entry = (key, _render_system_prompt(college_ctx))
+            self._entry = entry
+        return entry[1]
+
+
+def _format_active_reminders() -> str | None:
+    active = reminders.list_active()
+    if not active:
+        return None
+    lines = []
+    for r in active:
+        lines.append(f"- \"{r['message']}\" at {format_trigger_time(r['trigger_at'])}")
+    return "Active reminders:\n" + "\n".join(lines)
 
-def _build_thursday_messages(
-    conversation_id: str | None = None,
-    reminder_just_set: object | None = None,
-) -> list[dict]:
-    msgs: list[dict] = []
 
+def _render_system_prompt(college_ctx: str) -> str:
     # Build ONE consolidated system message to avoid confusing smaller models
     system_parts: list[str] = []
 
@@ -287,33 +522,44 @@ def _build_thursday_messages(
         system_parts.append(facts_block)
 
     # 3b. College data (marks, attendance, timetable)
-    college_ctx = get_college_context()
     if college_ctx:
         system_parts.append(college_ctx)
 
     # 4. Active reminders
-    active = reminders.list_active()
-    if active:
-        from datetime import datetime
-        lines = []
-        for r in active:
-            dt = datetime.fromtimestamp(r["trigger_at"])
-            lines.append(f"- \"{r['message']}\" at {dt.strftime('%I:%M %p on %B %d')}")
-        system_parts.append("Active reminders:\n" + "\n".join(lines))
+    reminders_block = _format_active_reminders()
+    if reminders_block:
+        system_parts.append(reminders_block)
+
+    return "\n\n".join(system_parts)
+
+
+_system_prompt_cache = _SystemPromptCache()
+
+
+def _build_thursday_messages(
+    conversation_id: str | None = None,
+    reminder_just_set: object | None = None,
+    pending_user_msg: str | None = None,
+) -> list[dict]:
+    msgs: list[dict] = []
+
+    system_prompt = _system_prompt_cache.get(get_college_context())
 
     # 5. Reminder-just-set note
     if reminder_just_set:
-        from datetime import datetime
         dt = datetime.fromtimestamp(reminder_just_set.trigger_at)
-        system_parts.append(
-            f"IMPORTANT: A reminder was just created: \"{reminder_just_set.message}\" "
+        system_prompt += (
+            f"\n\nIMPORTANT: A reminder was just created: \"{reminder_just_set.message}\" "
             f"scheduled for {dt.strftime('%I:%M %p')}. Notifications were sent. "
             f"Briefly confirm this to the user."
         )
 
-    msgs.append({"role": "system", "content": "\n\n".join(system_parts)})
+    msgs.append({"role": "system", "content": system_prompt})
 
     history = memory.get_recent_messages(conversation_id=conversation_id)
+    if pending_user_msg is not None:
+        # Not stored yet: history as it will be once it is
+        history = (history + [{"role": "user", "content": pending_user_msg}])[-SHORT_TERM_LIMIT:]
     msgs.extend(history)
     return msgs
 
@@ -324,35 +570,39 @@ def _build_thursday_messages(
 
 @app.get("/v1/conversations")
 async def list_conversations():
-    return JSONResponse({"conversations": memory.list_conversations()})
+    return ORJSONResponse({"conversations": memory.list_conversations()})
 
 
 @app.post("/v1/conversations")
 async def create_conversation():
     conv = memory.create_conversation()
-    return JSONResponse(conv)
+    return ORJSONResponse(conv)
 
 
 @app.get("/v1/conversations/{conv_id}")
 async def get_conversation(conv_id: str):
     messages = memory.get_conversation_messages(conv_id)
-    return JSONResponse({"conversation_id": conv_id, "messages": messages})
+    return ORJSONResponse({"conversation_id": conv_id, "messages": messages})
 
 
 @app.delete("/v1/conversations/{conv_id}")
 async def delete_conversation(conv_id: str):
+    global _whatsapp_conv_ready
     ok = memory.delete_conversation(conv_id)
+    _auto_titled_convs.discard(conv_id)
+    if conv_id == _WHATSAPP_CONV_ID:
+        _whatsapp_conv_ready = False
     if ok:
-        return JSONResponse({"status": "deleted"})
-    return JSONResponse({"status": "not_found"}, status_code=404)
+        return ORJSONResponse({"status": "deleted"})
+    return ORJSONResponse({"status": "not_found"}, status_code=404)
 
 
 @app.patch("/v1/conversations/{conv_id}")
 async def rename_conversation(conv_id: str, req: RenameRequest):
     ok = memory.rename_conversation(conv_id, req.title)
     if ok:
-        return JSONResponse({"status": "renamed", "title": req.title})
-    return JSONResponse({"status": "not_found"}, status_code=404)
+        return ORJSONResponse({"status": "renamed", "title": req.title})
+    return ORJSONResponse({"status": "not_found"}, status_code=404)
 
 
 # ------------------------------------------------------------------
@@ -361,21 +611,22 @@ async def rename_conversation(conv_id: str, req: RenameRequest):
 
 @app.get("/v1/memory")
 async def get_memory():
-    return JSONResponse({"facts": memory.list_facts()})
+    return ORJSONResponse({"facts": memory.list_facts()})
 
 
 @app.delete("/v1/memory/{fact_id}")
 async def delete_memory(fact_id: int):
     ok = memory.delete_fact(fact_id)
     if ok:
-        return JSONResponse({"status": "deleted", "id": fact_id})
-    return JSONResponse({"status": "not_found"}, status_code=404)
+        return ORJSONResponse({"status": "deleted", "id": fact_id})
+    return ORJSONResponse({"status": "not_found"}, status_code=404)
 
 
 @app.post("/v1/clear")
 async def clear_history():
     memory.clear_history()
-    return JSONResponse({"status": "cleared"})
+    _auto_titled_convs.clear()
+    return ORJSONResponse({"status": "cleared"})
 
 
 # ------------------------------------------------------------------
@@ -384,20 +635,20 @@ async def clear_history():
 
 @app.get("/v1/reminders")
 async def list_reminders():
-    return JSONResponse({"reminders": reminders.list_active()})
+    return ORJSONResponse({"reminders": reminders.list_active()})
 
 
 @app.get("/v1/reminders/all")
 async def list_all_reminders():
-    return JSONResponse({"reminders": reminders.list_all()})
+    return ORJSONResponse({"reminders": reminders.list_all()})
 
 
 @app.delete("/v1/reminders/{reminder_id}")
 async def delete_reminder(reminder_id: int):
     ok = reminders.delete_reminder(reminder_id)
     if ok:
-        return JSONResponse({"status": "deleted", "id": reminder_id})
-    return JSONResponse({"status": "not_found"}, status_code=404)
+        return ORJSONResponse({"status": "deleted", "id": reminder_id})
+    return ORJSONResponse({"status": "not_found"}, status_code=404)
 
 
 # ------------------------------------------------------------------
@@ -406,31 +657,31 @@ async def delete_reminder(reminder_id: int):
 
 # Dedicated conversation ID for WhatsApp — persists across messages
 _WHATSAPP_CONV_ID = "whatsapp-main"
+# Set once the conversation is known to exist; cleared if it is deleted
+_whatsapp_conv_ready = False
 
 
 def _ensure_whatsapp_conversation() -> None:
     """Create the WhatsApp conversation if it doesn't exist yet."""
-    convs = memory.list_conversations()
-    if not any(c["id"] == _WHATSAPP_CONV_ID for c in convs):
+    global _whatsapp_conv_ready
+    if _whatsapp_conv_ready:
+        return
+    if not memory.conversation_exists(_WHATSAPP_CONV_ID):
         memory.create_conversation(title="WhatsApp", conv_id=_WHATSAPP_CONV_ID)
+    _whatsapp_conv_ready = True
+
+
+# One C-level pass instead of four chained str.replace scans
+_TWIML_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+_TWIML_PRE = b'<?xml version="1.0" encoding="UTF-8"?><Response><Message>'
+_TWIML_POST = b"</Message></Response>"
+_TWIML_EMPTY = b'<?xml version="1.0" encoding="UTF-8"?><Response></Response>'
 
 
 def _twiml(body: str) -> Response:
     """Wrap a text reply in Twilio TwiML XML."""
-    safe = (
-        body
-        .replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-        .replace('"', "&quot;")
-    )
-    xml = (
-        '<?xml version="1.0" encoding="UTF-8"?>'
-        "<Response>"
-        f"<Message>{safe}</Message>"
-        "</Response>"
-    )
-    return Response(content=xml, media_type="application/xml")
+    safe = body.translate(_TWIML_ESCAPES).encode("utf-8")
+    return Response(content=_TWIML_PRE + safe + _TWIML_POST, media_type="application/xml")
 
 
 @app.post("/whatsapp")
@@ -459,85 +710,97 @@ async def whatsapp_webhook(
     background_tasks.add_task(_process_whatsapp_message, user_msg, sender)
 
     # Empty TwiML — the real reply comes via REST API
-    return Response(
-        content='<?xml version="1.0" encoding="UTF-8"?><Response></Response>',
-        media_type="application/xml",
-    )
+    return Response(content=_TWIML_EMPTY, media_type="application/xml")
 
 
-def _process_whatsapp_message(user_msg: str, sender: str) -> None:
+async def _process_whatsapp_message(user_msg: str, sender: str) -> None:
     """Run the full Thursday pipeline for a WhatsApp message.
 
     Called as a FastAPI BackgroundTask so the webhook can return
     instantly.  The reply is delivered via the Twilio REST API.
+    The DB and Twilio work runs on worker threads; the (long) wait for
+    the reply is awaited on the event loop, holding no thread.
     """
-    from notifier import send_whatsapp_long, send_whatsapp
+    from notifier import send_whatsapp
 
     t0 = _time.time()
     try:
-        _ensure_whatsapp_conversation()
-
-        # 1. Extract long-term facts
-        memory.try_extract_fact(user_msg)
-
-        # 2. Detect reminder intent
-        reminder_result = try_parse_user_reminder(user_msg)
-        reminder_created = None
-        if reminder_result:
-            time_expr, reminder_message = reminder_result
-            trigger_at = parse_time_expression(time_expr)
-            if trigger_at:
-                reminder_created = reminders.add_reminder(
-                    reminder_message, trigger_at, _WHATSAPP_CONV_ID
-                )
-                log.info("   ⏰ Reminder set: '%s' → fires in %.0fs", reminder_message, trigger_at - _time.time())
-                send_reminder_set_notification(reminder_message, trigger_at)
-
-        # 3. Save user message to memory
-        memory.add_message("user", user_msg, _WHATSAPP_CONV_ID)
-
-        # 4. Build augmented messages (personality + facts + history + reminders)
-        augmented = _build_thursday_messages(
-            _WHATSAPP_CONV_ID, reminder_just_set=reminder_created
-        )
+        augmented = await asyncio.to_thread(_prepare_whatsapp_turn, user_msg)
 
         # 5. Get blocking (non-streaming) response
         log.info("   Generating response...")
-        reply = llama.blocking_chat(augmented, temperature=0.7, max_tokens=1024)
-
-        # 6. Process any [REMIND:] tags in the reply
-        _process_reminders(reply, _WHATSAPP_CONV_ID)
-        clean_reply = strip_reminder_tags(reply)
-
-        # 7. Save assistant reply to memory
-        memory.add_message("assistant", clean_reply, _WHATSAPP_CONV_ID)
-
-        elapsed = _time.time() - t0
-        log.info(
-            "   ✓ WhatsApp response done — %d chars, %.1fs",
-            len(clean_reply), elapsed,
-        )
+        reply = await llama.achat(augmented, temperature=0.7, max_tokens=1024)
 
-        # 8. Send via Twilio REST API (auto-splits long messages)
-        send_whatsapp_long(clean_reply)
-        log.info("   ✓ Delivered to WhatsApp")
+        await asyncio.to_thread(_finish_whatsapp_turn, reply, t0)
 
     except Exception as exc:
         log.error("   ✗ WhatsApp processing failed: %s", exc, exc_info=True)
         try:
-            send_whatsapp("⚠️ Sorry, something went wrong. Try again in a moment.")
+            await asyncio.to_thread(
+                send_whatsapp, "⚠️ Sorry, something went wrong. Try again in a moment."
+            )
         except Exception:
             log.error("   ✗ Failed to send error message to WhatsApp")
 
 
+def _prepare_whatsapp_turn(user_msg: str) -> list[dict]:
+    """Steps 1-4: store what the message implies, return the prompt."""
+    _ensure_whatsapp_conversation()
+
+    # 1. Extract long-term facts
+    memory.try_extract_fact(user_msg)
+
+    # 2. Detect reminder intent
+    reminder_result = try_parse_user_reminder(user_msg)
+    reminder_created = None
+    if reminder_result:
+        time_expr, reminder_message = reminder_result
+        trigger_at = parse_time_expression(time_expr)
+        if trigger_at:
+            reminder_created = reminders.add_reminder(
+                reminder_message, trigger_at, _WHATSAPP_CONV_ID
+            )
+            log.info("   ⏰ Reminder set: '%s' → fires in %.0fs", reminder_message, trigger_at - _time.time())
+            queue_reminder_set_notification(reminder_message, trigger_at)
+
+    # 3. Save user message to memory
+    memory.add_message("user", user_msg, _WHATSAPP_CONV_ID)
+
+    # 4. Build augmented messages (personality + facts + history + reminders)
+    return _build_thursday_messages(
+        _WHATSAPP_CONV_ID, reminder_just_set=reminder_created
+    )
+
+
+def _finish_whatsapp_turn(reply: str, t0: float) -> None:
+    """Steps 6-8: handle reminder tags, store and deliver the reply."""
+    from notifier import send_whatsapp_long
+
+    # 6. Process any [REMIND:] tags in the reply
+    clean_reply = _process_reminders(reply, _WHATSAPP_CONV_ID)
+
+    # 7. Save assistant reply to memory
+    memory.add_message("assistant", clean_reply, _WHATSAPP_CONV_ID)
+
+    elapsed = _time.time() - t0
+    log.info(
+        "   ✓ WhatsApp response done — %d chars, %.1fs",
+        len(clean_reply), elapsed,
+    )
+
+    # 8. Send via Twilio REST API (auto-splits long messages)
+    send_whatsapp_long(clean_reply)
+    log.info("   ✓ Delivered to WhatsApp")
+
+
 # ------------------------------------------------------------------
 # Health
 # ------------------------------------------------------------------
 
 @app.get("/health")
 async def health():
-    llama_ok = llama.health_check()
-    return JSONResponse({
+    llama_ok = await llama.ahealth_check()
+    return ORJSONResponse({
         "proxy": "ok",
         "llama_server": "ok" if llama_ok else "unreachable",
     })
@@ -552,14 +815,61 @@ app.mount("/static", StaticFiles(directory=os.path.join(
 )), name="static")
 
 
-@app.get("/")
-async def serve_ui():
-    return FileResponse(
-        os.path.join(os.path.dirname(__file__), "ui", "index.html"),
-        media_type="text/html; charset=utf-8",
+# index.html is read, hashed and gzipped once; the page is then served from
+# memory with an ETag, so reloads are a 304 with no disk access.  The two
+# codings are different representations, so each gets its own strong tag.
+_INDEX_HTML = Path(__file__).resolve().parent.joinpath("ui", "index.html").read_bytes()
+_INDEX_GZ = gzip.compress(_INDEX_HTML, mtime=0)
+_INDEX_SHA1 = hashlib.sha1(_INDEX_HTML).hexdigest()
+_INDEX_ETAG = f'"{_INDEX_SHA1}"'
+_INDEX_GZ_ETAG = f'"{_INDEX_SHA1}-gz"'
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """True if an Accept-Encoding header allows gzip (``gzip;q=0`` doesn't)."""
+    star = False
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if coding not in ("gzip", "*"):
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding == "gzip":
+            return q > 0
+        star = q > 0
+    return star
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison over a comma-separated list."""
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
     )
 
 
+@app.get("/")
+async def serve_ui(request: Request):
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        body, etag = _INDEX_GZ, _INDEX_GZ_ETAG
+    else:
+        body, etag = _INDEX_HTML, _INDEX_ETAG
+    headers = {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    if body is _INDEX_GZ:
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="text/html; charset=utf-8", headers=headers)
+
+
 # ------------------------------------------------------------------
 # Run
 # ------------------------------------------------------------------
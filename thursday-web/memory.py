@@ -10,7 +10,9 @@ Extension point: add an embeddings index (FAISS / Chroma) alongside
 the SQLite facts table for semantic memory retrieval.
 """
 
+import re
 import sqlite3
+import threading
 import time
 import uuid
 from dataclasses import dataclass
@@ -23,6 +25,14 @@ from config import (
     SHORT_TERM_LIMIT,
 )
 
+# All trigger prefixes as one alternation, matched case-insensitively so
+# the message needn't be lower-cased first; the leading \s* stands in for
+# strip(), so a non-matching message is never copied at all
+_TRIGGER_RE = re.compile(
+    r"\s*(?:" + "|".join(re.escape(p) for p in MEMORY_TRIGGER_PREFIXES) + ")",
+    re.IGNORECASE,
+)
+
 
 @dataclass(slots=True)
 class Fact:
@@ -36,10 +46,48 @@ class MemoryStore:
 
     def __init__(self, db_path: str | None = None) -> None:
         self._db_path = str(db_path or DB_FILE)
-        self._conn = sqlite3.connect(self._db_path, check_same_thread=False)
-        self._conn.execute("PRAGMA journal_mode=WAL")
+        # One connection per thread (event loop, threadpool, background
+        # tasks), so WAL readers don't queue behind a shared connection
+        self._local = threading.local()
+        self._conns: list[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+        # Bumped on every change to long_term_facts; get_facts_block()
+        # re-renders only when it has moved
+        self.facts_version = 0
+        self._facts_block: tuple[int, str | None] | None = None
+        # conversation_id -> its last SHORT_TERM_LIMIT messages, kept in
+        # step with add_message so a chat turn doesn't re-query history
+        self._recent: dict[str, list[dict]] = {}
+        self._recent_lock = threading.Lock()
         self._init_tables()
 
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        # check_same_thread=False only so close() can close every thread's
+        # connection; each is otherwise used by its own thread alone
+        # cached_statements: room for every statement this class issues,
+        # so none is ever re-prepared once warm
+        conn = sqlite3.connect(self._db_path, check_same_thread=False, cached_statements=256)
+        # page_size only takes effect on a new database, before WAL is on
+        conn.execute("PRAGMA page_size=8192")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # durable enough under WAL
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+        conn.execute("PRAGMA wal_autocheckpoint=1000")
+        with self._conns_lock:
+            self._conns.append(conn)
+        return conn
+
     def _init_tables(self) -> None:
         self._conn.executescript("""
             CREATE TABLE IF NOT EXISTS conversations (
@@ -65,6 +113,23 @@ class MemoryStore:
             CREATE INDEX IF NOT EXISTS idx_chat_ts   ON chat_history(timestamp);
             CREATE INDEX IF NOT EXISTS idx_facts_ts  ON long_term_facts(created_at);
             CREATE INDEX IF NOT EXISTS idx_conv_upd  ON conversations(updated_at);
+            CREATE TRIGGER IF NOT EXISTS trg_chat_touch AFTER INSERT ON chat_history
+            BEGIN
+                UPDATE conversations SET updated_at = NEW.timestamp WHERE id = NEW.conversation_id;
+            END;
+        """)
+        # Keeps each conversation to its newest DB_PRUNE_THRESHOLD rows.
+        # Recreated every start, since the threshold is baked into it.
+        self._conn.executescript(f"""
+            DROP TRIGGER IF EXISTS trg_chat_prune;
+            CREATE TRIGGER trg_chat_prune AFTER INSERT ON chat_history
+            BEGIN
+                DELETE FROM chat_history
+                WHERE conversation_id = NEW.conversation_id
+                  AND id <= (SELECT id FROM chat_history
+                             WHERE conversation_id = NEW.conversation_id
+                             ORDER BY id DESC LIMIT 1 OFFSET {int(DB_PRUNE_THRESHOLD)});
+            END;
         """)
         self._conn.commit()
 
@@ -81,13 +146,20 @@ class MemoryStore:
         self._conn.commit()
         return {"id": conv_id, "title": title, "created_at": now, "updated_at": now}
 
+    def conversation_exists(self, conv_id: str) -> bool:
+        return self._conn.execute(
+            "SELECT EXISTS(SELECT 1 FROM conversations WHERE id = ?)", (conv_id,)
+        ).fetchone()[0] == 1
+
     def list_conversations(self) -> list[dict]:
-        rows = self._conn.execute(
+        # Iterate the cursor and unpack each row tuple straight into the
+        # JSON-ready dict, with no intermediate fetchall() list
+        cur = self._conn.execute(
             "SELECT id, title, created_at, updated_at FROM conversations ORDER BY updated_at DESC"
-        ).fetchall()
+        )
         return [
-            {"id": r[0], "title": r[1], "created_at": r[2], "updated_at": r[3]}
-            for r in rows
+            {"id": i, "title": t, "created_at": c, "updated_at": u}
+            for i, t, c, u in cur
         ]
 
     def rename_conversation(self, conv_id: str, title: str) -> bool:
@@ -98,17 +170,14 @@ class MemoryStore:
         return cur.rowcount > 0
 
     def delete_conversation(self, conv_id: str) -> bool:
-        self._conn.execute("DELETE FROM chat_history WHERE conversation_id = ?", (conv_id,))
-        cur = self._conn.execute("DELETE FROM conversations WHERE id = ?", (conv_id,))
-        self._conn.commit()
+        # Under the lock, so a reader can't re-cache the pre-delete history
+        with self._recent_lock:
+            self._conn.execute("DELETE FROM chat_history WHERE conversation_id = ?", (conv_id,))
+            cur = self._conn.execute("DELETE FROM conversations WHERE id = ?", (conv_id,))
+            self._conn.commit()
+            self._recent.pop(conv_id, None)
         return cur.rowcount > 0
 
-    def _touch_conversation(self, conv_id: str) -> None:
-        self._conn.execute(
-            "UPDATE conversations SET updated_at = ? WHERE id = ?",
-            (time.time(), conv_id),
-        )
-
     def auto_title_conversation(self, conv_id: str, first_message: str) -> str:
         """Generate a short title from the first user message."""
         title = first_message[:50].strip()
@@ -121,18 +190,32 @@ class MemoryStore:
 
     def add_message(self, role: str, content: str, conversation_id: str | None = None) -> None:
         conv_id = conversation_id or "__default__"
-        self._conn.execute(
-            "INSERT INTO chat_history (conversation_id, role, content, timestamp) VALUES (?, ?, ?, ?)",
-            (conv_id, role, content, time.time()),
-        )
-        self._touch_conversation(conv_id)
-        self._conn.commit()
-        self._maybe_prune(conv_id)
+        with self._recent_lock:
+            # One transaction; trg_chat_touch bumps conversations.updated_at
+            # and trg_chat_prune drops rows past DB_PRUNE_THRESHOLD
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO chat_history (conversation_id, role, content, timestamp) VALUES (?, ?, ?, ?)",
+                    (conv_id, role, content, time.time()),
+                )
+            cached = self._recent.get(conv_id)
+            if cached is not None:
+                # Rebuilt rather than mutated, so readers never see a half-trimmed list
+                self._recent[conv_id] = (cached + [{"role": role, "content": content}])[-SHORT_TERM_LIMIT:]
 
     def get_recent_messages(
         self, limit: int = SHORT_TERM_LIMIT, conversation_id: str | None = None
     ) -> list[dict]:
         conv_id = conversation_id or "__default__"
+        if limit == SHORT_TERM_LIMIT:
+            cached = self._recent.get(conv_id)
+            if cached is None:
+                with self._recent_lock:
+                    cached = self._recent[conv_id] = self._query_recent(conv_id, limit)
+            return list(cached)
+        return self._query_recent(conv_id, limit)
+
+    def _query_recent(self, conv_id: str, limit: int) -> list[dict]:
         rows = self._conn.execute(
             "SELECT role, content FROM chat_history WHERE conversation_id = ? ORDER BY id DESC LIMIT ?",
             (conv_id, limit),
@@ -147,6 +230,16 @@ class MemoryStore:
         ).fetchall()
         return [{"role": r, "content": c} for r, c in rows]
 
+    def is_first_message(self, conversation_id: str) -> bool:
+        """True if the conversation holds exactly one message.
+
+        Stops scanning at the second row instead of counting them all.
+        """
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM (SELECT 1 FROM chat_history WHERE conversation_id = ? LIMIT 2)",
+            (conversation_id,),
+        ).fetchone()[0] == 1
+
     def get_conversation_message_count(self, conversation_id: str) -> int:
         return self._conn.execute(
             "SELECT COUNT(*) FROM chat_history WHERE conversation_id = ?",
@@ -154,24 +247,15 @@ class MemoryStore:
         ).fetchone()[0]
 
     def clear_history(self, conversation_id: str | None = None) -> None:
-        if conversation_id:
-            self._conn.execute("DELETE FROM chat_history WHERE conversation_id = ?", (conversation_id,))
-        else:
-            self._conn.execute("DELETE FROM chat_history")
-        self._conn.commit()
-
-    def _maybe_prune(self, conv_id: str) -> None:
-        count = self._conn.execute(
-            "SELECT COUNT(*) FROM chat_history WHERE conversation_id = ?", (conv_id,)
-        ).fetchone()[0]
-        if count > DB_PRUNE_THRESHOLD:
-            excess = count - DB_PRUNE_THRESHOLD
-            self._conn.execute(
-                "DELETE FROM chat_history WHERE id IN "
-                "(SELECT id FROM chat_history WHERE conversation_id = ? ORDER BY id ASC LIMIT ?)",
-                (conv_id, excess),
-            )
-            self._conn.commit()
+        with self._recent_lock:
+            if conversation_id:
+                self._conn.execute("DELETE FROM chat_history WHERE conversation_id = ?", (conversation_id,))
+                self._conn.commit()
+                self._recent.pop(conversation_id, None)
+            else:
+                self._conn.execute("DELETE FROM chat_history")
+                self._conn.commit()
+                self._recent.clear()
 
     # ---- Long-term ----
 
@@ -180,23 +264,24 @@ class MemoryStore:
         Check if user message contains a memorizable fact.
         Extension point: replace with LLM-based extraction or NER.
         """
-        lower = user_message.lower().strip()
-        for prefix in MEMORY_TRIGGER_PREFIXES:
-            if lower.startswith(prefix):
-                fact = user_message.strip()
-                self._store_fact(fact)
-                return fact
+        m = _TRIGGER_RE.match(user_message)
+        # The trigger must end inside the text proper, as if matched on the
+        # stripped message ("i use " alone is not a fact)
+        if m and m.end() <= len(user_message.rstrip()):
+            fact = user_message.strip()
+            self._store_fact(fact)
+            return fact
         return None
 
     def _store_fact(self, fact: str) -> None:
-        try:
-            self._conn.execute(
-                "INSERT INTO long_term_facts (content, created_at) VALUES (?, ?)",
+        # Duplicates are dropped by the UNIQUE constraint, not an exception
+        with self._conn:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO long_term_facts (content, created_at) VALUES (?, ?)",
                 (fact, time.time()),
             )
-            self._conn.commit()
-        except sqlite3.IntegrityError:
-            pass
+        if cur.rowcount:
+            self.facts_version += 1
 
     def get_facts(self, limit: int = LONG_TERM_MAX_INJECT) -> list[Fact]:
         rows = self._conn.execute(
@@ -207,20 +292,35 @@ class MemoryStore:
         return [Fact(id=r[0], content=r[1], created_at=r[2]) for r in rows]
 
     def get_facts_block(self) -> str | None:
+        cached = self._facts_block
+        if cached is not None and cached[0] == self.facts_version:
+            return cached[1]
+        version = self.facts_version
         facts = self.get_facts()
-        if not facts:
-            return None
-        lines = [f"- {f.content}" for f in facts]
-        return "Things you know about the user:\n" + "\n".join(lines)
+        block = None
+        if facts:
+            lines = [f"- {f.content}" for f in facts]
+            block = "Things you know about the user:\n" + "\n".join(lines)
+        self._facts_block = (version, block)
+        return block
 
     def delete_fact(self, fact_id: int) -> bool:
         cur = self._conn.execute("DELETE FROM long_term_facts WHERE id = ?", (fact_id,))
         self._conn.commit()
+        if cur.rowcount:
+            self.facts_version += 1
         return cur.rowcount > 0
 
     def list_facts(self) -> list[dict]:
-        facts = self.get_facts(limit=100)
-        return [{"id": f.id, "content": f.content} for f in facts]
+        # Same rows as get_facts(limit=100), minus the Fact objects
+        cur = self._conn.execute(
+            "SELECT id, content FROM long_term_facts ORDER BY created_at DESC LIMIT 100"
+        )
+        return [{"id": i, "content": c} for i, c in cur]
 
     def close(self) -> None:
-        self._conn.close()
+        self._conn.execute("PRAGMA optimize")
+        with self._conns_lock:
+            for conn in self._conns:
+                conn.close()
+            self._conns.clear()
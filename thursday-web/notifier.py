@@ -13,14 +13,24 @@ Usage:
     notify("Hello!", channel="all")           # Both channels
     notify("Hello!")                           # Default: Discord
 
+notify() only queues the message: a worker thread sends it, so the
+caller never waits on the network.  notify_sync() sends inline and
+returns whether it was delivered; notify_async() is the event-loop form.
+
 If a channel fails, the module falls back to the other channel
 automatically.  All errors are logged, never raised.
 """
 
+import asyncio
+import atexit
+import importlib.util
 import logging
 import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-import requests
+import httpx
 
 log = logging.getLogger("thursday.notifier")
 
@@ -40,39 +50,110 @@ TWILIO_WHATSAPP_TO: str = os.getenv("TWILIO_WHATSAPP_TO", "")
 # Channel availability checks
 # ---------------------------------------------------------------------------
 
+# The environment is read once at import, so this is settled from then on
+_DISCORD_OK: bool = bool(DISCORD_WEBHOOK_URL)
+_WHATSAPP_OK: bool = all([TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN,
+                          TWILIO_WHATSAPP_FROM, TWILIO_WHATSAPP_TO])
+
+
 def discord_configured() -> bool:
-    return bool(DISCORD_WEBHOOK_URL)
+    return _DISCORD_OK
 
 
 def whatsapp_configured() -> bool:
-    return all([TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN,
-                TWILIO_WHATSAPP_FROM, TWILIO_WHATSAPP_TO])
+    return _WHATSAPP_OK
 
 
 # ---------------------------------------------------------------------------
 # Discord
 # ---------------------------------------------------------------------------
 
+# One client per flavour, created on first use, so repeat webhook calls
+# reuse the pooled keep-alive TLS connection instead of a fresh handshake.
+# With h2 installed (httpx[http2]) they speak HTTP/2 to Discord, so a burst
+# of concurrent posts shares one connection as multiplexed streams.
+_discord_client: httpx.Client | None = None
+_discord_aclient: httpx.AsyncClient | None = None
+_HTTP2 = importlib.util.find_spec("h2") is not None
+_DISCORD_LIMITS = httpx.Limits(max_keepalive_connections=8)
+
+
+def _get_discord_client() -> httpx.Client:
+    global _discord_client
+    if _discord_client is None:
+        _discord_client = httpx.Client(http2=_HTTP2, timeout=10, limits=_DISCORD_LIMITS)
+        atexit.register(_discord_client.close)
+    return _discord_client
+
+
+def _get_discord_aclient() -> httpx.AsyncClient:
+    global _discord_aclient
+    if _discord_aclient is None:
+        _discord_aclient = httpx.AsyncClient(http2=_HTTP2, timeout=10, limits=_DISCORD_LIMITS)
+    return _discord_aclient
+
+
+# wait=false (also Discord's default) has the webhook answer 204 at once
+# rather than returning the created message; it's added explicitly unless
+# the configured URL already says otherwise.
+if not DISCORD_WEBHOOK_URL or "wait=" in DISCORD_WEBHOOK_URL:
+    _DISCORD_POST_URL = DISCORD_WEBHOOK_URL
+else:
+    _DISCORD_POST_URL = DISCORD_WEBHOOK_URL + ("&" if "?" in DISCORD_WEBHOOK_URL else "?") + "wait=false"
+
+
+def _discord_sent(r: httpx.Response) -> bool:
+    ok = r.is_success
+    if not ok:
+        log.error("Discord returned %s: %s", r.status_code, r.text[:200])
+    return ok
+
+
 def send_discord(message: str, *, username: str = "Thursday AI") -> bool:
     """Send a message via Discord webhook.  Returns True on success."""
-    if not discord_configured():
+    if not _DISCORD_OK:
+        log.warning("Discord webhook not configured — skipping.")
+        return False
+    try:
+        r = _get_discord_client().post(
+            _DISCORD_POST_URL,
+            json={"content": message, "username": username},
+        )
+        return _discord_sent(r)
+    except Exception as exc:
+        log.error("Discord webhook error: %s", exc)
+        return False
+
+
+async def send_discord_async(message: str, *, username: str = "Thursday AI") -> bool:
+    """send_discord() for the event loop — the POST holds no thread."""
+    if not _DISCORD_OK:
         log.warning("Discord webhook not configured — skipping.")
         return False
     try:
-        r = requests.post(
-            DISCORD_WEBHOOK_URL,
+        r = await _get_discord_aclient().post(
+            _DISCORD_POST_URL,
             json={"content": message, "username": username},
-            timeout=10,
         )
-        ok = r.status_code in (200, 204)
-        if not ok:
-            log.error("Discord returned %s: %s", r.status_code, r.text[:200])
-        return ok
+        return _discord_sent(r)
     except Exception as exc:
         log.error("Discord webhook error: %s", exc)
         return False
 
 
+async def aclose() -> None:
+    """Flush queued notifications, then close the shared Discord clients
+    (call on shutdown)."""
+    global _discord_client, _discord_aclient
+    await asyncio.to_thread(_stop_worker, 15)
+    if _discord_aclient is not None:
+        await _discord_aclient.aclose()
+        _discord_aclient = None
+    if _discord_client is not None:
+        _discord_client.close()
+        _discord_client = None
+
+
 # ---------------------------------------------------------------------------
 # WhatsApp (Twilio)
 # ---------------------------------------------------------------------------
@@ -82,41 +163,58 @@ def _split_message(text: str, limit: int = 1500) -> list[str]:
 
     Tries to break at newlines first, then at spaces, to avoid
     cutting code blocks or sentences in the middle of a word.
+    Walks a cursor over *text*, so each character is copied once.
     """
-    if len(text) <= limit:
+    n = len(text)
+    if n <= limit:
         return [text]
 
     chunks: list[str] = []
-    remaining = text
-    while remaining:
-        if len(remaining) <= limit:
-            chunks.append(remaining)
+    start = 0
+    while start < n:
+        end = start + limit
+        if end >= n:
+            chunks.append(text[start:])
             break
 
         # Try to split at the last newline within the limit
-        idx = remaining.rfind("\n", 0, limit)
+        idx = text.rfind("\n", start, end)
         if idx == -1:
             # Fall back to the last space
-            idx = remaining.rfind(" ", 0, limit)
-        if idx == -1:
-            # No good break point — hard cut
-            idx = limit
-
-        chunks.append(remaining[:idx])
-        remaining = remaining[idx:].lstrip("\n")  # drop the split newline
+            idx = text.rfind(" ", start, end)
+        if idx <= start:
+            # No good break point (or only one at the very start, which
+            # would make no progress) — hard cut
+            idx = end
+
+        chunks.append(text[start:idx])
+        start = idx
+        while start < n and text[start] == "\n":  # drop the split newline(s)
+            start += 1
     return chunks
 
 
+# Built on first use and kept, so repeat sends reuse the SDK's HTTP
+# session (and its warm TLS connection) instead of a new one each time.
+_twilio_client_singleton = None
+
+
+def _twilio_client():
+    global _twilio_client_singleton
+    if _twilio_client_singleton is None:
+        from twilio.rest import Client
+
+        _twilio_client_singleton = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+    return _twilio_client_singleton
+
+
 def send_whatsapp(message: str) -> bool:
     """Send a WhatsApp message via Twilio.  Returns True on success."""
-    if not whatsapp_configured():
+    if not _WHATSAPP_OK:
         log.warning("Twilio WhatsApp not configured — skipping.")
         return False
     try:
-        from twilio.rest import Client
-
-        client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-        msg = client.messages.create(
+        _twilio_client().messages.create(
             body=message,
             from_=f"whatsapp:{TWILIO_WHATSAPP_FROM}",
             to=f"whatsapp:{TWILIO_WHATSAPP_TO}",
@@ -127,41 +225,50 @@ def send_whatsapp(message: str) -> bool:
         return False
 
 
+async def send_whatsapp_async(message: str) -> bool:
+    """send_whatsapp() off the event loop (the Twilio SDK is sync-only)."""
+    return await asyncio.to_thread(send_whatsapp, message)
+
+
 def send_whatsapp_long(message: str) -> bool:
     """Send a long WhatsApp message, splitting into multiple parts if needed.
 
     Each Twilio WhatsApp message is limited to ~1600 chars.  This function
-    splits the message at line/word boundaries and sends each chunk in order.
+    splits the message at line/word boundaries and sends the chunks
+    concurrently, each labelled with its position.
     Returns True if ALL parts were delivered.
     """
-    if not whatsapp_configured():
+    if not _WHATSAPP_OK:
         log.warning("Twilio WhatsApp not configured — skipping.")
         return False
 
     chunks = _split_message(message, limit=1500)
+    n = len(chunks)
+    bodies = [f"({i}/{n}) {chunk}" for i, chunk in enumerate(chunks, 1)] if n > 1 else chunks
 
     try:
-        from twilio.rest import Client
-        import time as _time
+        client = _twilio_client()
 
-        client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-        all_ok = True
-        for i, chunk in enumerate(chunks, 1):
-            label = f"({i}/{len(chunks)}) " if len(chunks) > 1 else ""
-            body = f"{label}{chunk}" if label else chunk
+        def send_part(i: int, body: str) -> bool:
             try:
                 client.messages.create(
                     body=body,
                     from_=f"whatsapp:{TWILIO_WHATSAPP_FROM}",
                     to=f"whatsapp:{TWILIO_WHATSAPP_TO}",
                 )
+                return True
             except Exception as exc:
-                log.error("WhatsApp part %d/%d failed: %s", i, len(chunks), exc)
-                all_ok = False
-            # Small delay between parts so they arrive in order
-            if i < len(chunks):
-                _time.sleep(1)
-        return all_ok
+                log.error("WhatsApp part %d/%d failed: %s", i, n, exc)
+                return False
+
+        if n == 1:
+            return send_part(1, bodies[0])
+        # The SDK is sync, so the parts go out from a small pool with their
+        # round-trips overlapped.  They may land out of order; the "(i/n)"
+        # labels say where each belongs.
+        with ThreadPoolExecutor(max_workers=min(4, n)) as ex:
+            futures = [ex.submit(send_part, i, body) for i, body in enumerate(bodies, 1)]
+            return all([f.result() for f in futures])
     except Exception as exc:
         log.error("WhatsApp (Twilio) error: %s", exc)
         return False
@@ -171,12 +278,78 @@ def send_whatsapp_long(message: str) -> bool:
 # Unified dispatcher with automatic fallback
 # ---------------------------------------------------------------------------
 
-def notify(message: str, channel: str = "discord") -> bool:
-    """Send a notification on the chosen channel.
+def _notify_all(message: str) -> bool:
+    d = send_discord(message)
+    w = send_whatsapp(message)
+    return d or w
+
+
+def _notify_whatsapp(message: str) -> bool:
+    if send_whatsapp(message):
+        return True
+    log.warning("WhatsApp failed — falling back to Discord.")
+    return send_discord(message)
+
+
+def _notify_discord(message: str) -> bool:
+    if send_discord(message):
+        return True
+    log.warning("Discord failed — falling back to WhatsApp.")
+    return send_whatsapp(message)
+
+
+async def _notify_all_async(message: str) -> bool:
+    # Both at once, so this takes as long as the slower channel
+    d, w = await asyncio.gather(
+        send_discord_async(message), send_whatsapp_async(message),
+        return_exceptions=True,
+    )
+    return d is True or w is True
+
+
+async def _notify_whatsapp_async(message: str) -> bool:
+    if await send_whatsapp_async(message):
+        return True
+    log.warning("WhatsApp failed — falling back to Discord.")
+    return await send_discord_async(message)
+
+
+async def _notify_discord_async(message: str) -> bool:
+    if await send_discord_async(message):
+        return True
+    log.warning("Discord failed — falling back to WhatsApp.")
+    return await send_whatsapp_async(message)
+
+
+_DISPATCH = {
+    "discord": _notify_discord,
+    "whatsapp": _notify_whatsapp,
+    "all": _notify_all,
+}
+_DISPATCH_ASYNC = {
+    "discord": _notify_discord_async,
+    "whatsapp": _notify_whatsapp_async,
+    "all": _notify_all_async,
+}
+
+
+def _channel_key(channel: str) -> str:
+    if channel in _DISPATCH:
+        return channel
+    key = channel.lower().strip()
+    if key not in _DISPATCH:
+        log.warning("Unknown notification channel %r — using Discord.", channel)
+        return "discord"
+    return key
+
+
+def notify_sync(message: str, channel: str = "discord") -> bool:
+    """Send a notification on the chosen channel, and wait for it.
 
     Args:
         message:  Text to send.
-        channel:  "discord" | "whatsapp" | "all"
+        channel:  "discord" | "whatsapp" | "all"  (anything else is
+                  logged and treated as "discord")
 
     Fallback logic:
         - If the primary channel fails, the other channel is tried.
@@ -185,21 +358,68 @@ def notify(message: str, channel: str = "discord") -> bool:
 
     Returns True if at least one channel delivered successfully.
     """
-    channel = channel.lower().strip()
+    return _DISPATCH[_channel_key(channel)](message)
 
-    if channel == "all":
-        d = send_discord(message)
-        w = send_whatsapp(message)
-        return d or w
 
-    if channel == "whatsapp":
-        if send_whatsapp(message):
-            return True
-        log.warning("WhatsApp failed — falling back to Discord.")
-        return send_discord(message)
+async def notify_async(message: str, channel: str = "discord") -> bool:
+    """notify_sync() for the event loop.
 
-    # default: discord
-    if send_discord(message):
+    ``channel="all"`` sends on both channels concurrently.  The fallback
+    cases stay sequential: the second channel is only for when the first
+    fails.
+    """
+    return await _DISPATCH_ASYNC[_channel_key(channel)](message)
+
+
+# ---------------------------------------------------------------------------
+# Background sending
+# ---------------------------------------------------------------------------
+
+_send_queue: "queue.Queue[tuple | None]" = queue.Queue(maxsize=1000)
+_worker: threading.Thread | None = None
+_worker_lock = threading.Lock()
+
+
+def _drain_queue() -> None:
+    while (job := _send_queue.get()) is not None:
+        fn, args = job
+        try:
+            fn(*args)
+        except Exception as exc:
+            log.error("Background notification error: %s", exc)
+
+
+def send_in_background(fn, *args) -> bool:
+    """Queue ``fn(*args)`` for the notification worker thread.
+
+    Returns True once queued (not delivered); False if the queue is full.
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_drain_queue, name="notifier", daemon=True)
+            _worker.start()
+    try:
+        _send_queue.put_nowait((fn, args))
         return True
-    log.warning("Discord failed — falling back to WhatsApp.")
-    return send_whatsapp(message)
+    except queue.Full:
+        log.warning("Notification queue full — dropping message.")
+        return False
+
+
+def notify(message: str, channel: str = "discord") -> bool:
+    """Queue a notification (see notify_sync()) and return at once.
+
+    Returns True if it was queued.
+    """
+    return send_in_background(notify_sync, message, channel)
+
+
+def _stop_worker(timeout: float) -> None:
+    """Let the worker finish what is queued, then end it."""
+    global _worker
+    with _worker_lock:
+        worker, _worker = _worker, None
+    if worker is not None:
+        _send_queue.put(None)
+        worker.join(timeout)
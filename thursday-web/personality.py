@@ -5,26 +5,63 @@ Reads personality.txt and provides system prompt injection.
 Extension point: swap for dynamic per-user personality profiles.
 """
 
+import os
+import time
 from pathlib import Path
 from config import PERSONALITY_FILE
 
+# Seconds between mtime checks of the personality file
+_STAT_INTERVAL = 2.0
+
 
 class Personality:
-    """Loads and caches the system personality prompt."""
+    """Loads and caches the system personality prompt.
+
+    Edits to the file are picked up without a restart: ``version`` stats
+    it (at most every _STAT_INTERVAL seconds) and drops the cached text
+    when its mtime has moved.
+    """
 
     def __init__(self, filepath: Path = PERSONALITY_FILE) -> None:
         self._filepath = filepath
         self._text: str | None = None
+        self._mtime: int | None = None
+        self._checked_at = 0.0
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Bumped whenever the cached text is dropped, so callers can
+        tell when anything derived from it is out of date."""
+        now = time.monotonic()
+        if self._text is not None and now - self._checked_at >= _STAT_INTERVAL:
+            self._checked_at = now
+            try:
+                mtime = self._filepath.stat().st_mtime_ns
+            except OSError:
+                mtime = self._mtime  # keep serving the last good text
+            if mtime != self._mtime:
+                self._text = None
+                self._version += 1
+        return self._version
 
     def load(self) -> str:
         if self._text is None:
-            if not self._filepath.exists():
-                raise FileNotFoundError(f"Personality file not found: {self._filepath}")
-            self._text = self._filepath.read_text(encoding="utf-8").strip()
+            # One open: the mtime comes from fstat on the same descriptor,
+            # so it always belongs to the bytes that were read
+            try:
+                with open(self._filepath, encoding="utf-8") as f:
+                    self._mtime = os.fstat(f.fileno()).st_mtime_ns
+                    data = f.read()
+            except FileNotFoundError:
+                raise FileNotFoundError(f"Personality file not found: {self._filepath}") from None
+            self._checked_at = time.monotonic()
+            self._text = data.strip()
         return self._text
 
     def reload(self) -> str:
         self._text = None
+        self._version += 1
         return self.load()
 
     def as_system_message(self) -> dict:
@@ -12,10 +12,11 @@ Usage flow:
   2. Server detects reminder intent from user message (try_parse_user_reminder)
   3. Time + message are parsed, reminder stored in DB
   4. Discord webhook notifies that reminder is set
-  5. Background loop checks every 10s for due reminders, fires them
+  5. Background loop sleeps until the next reminder is due, fires it
   6. AI is told a reminder was set so it can confirm naturally
 """
 
+import asyncio
 import re
 import sqlite3
 import time
@@ -23,10 +24,17 @@ import math
 import threading
 from datetime import datetime, timedelta
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, Optional
 
 from config import DISCORD_USER_ID
-from notifier import notify, send_discord
+from notifier import (
+    send_discord,
+    send_discord_async,
+    send_in_background,
+    send_whatsapp,
+    send_whatsapp_async,
+)
 
 
 # ------------------------------------------------------------------
@@ -52,7 +60,22 @@ class ReminderStore:
 
     def __init__(self, db_path: str) -> None:
         self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        # Rows come back as sqlite3.Row, so listings are a C-level dict copy
+        self._conn.row_factory = sqlite3.Row
         self._conn.execute("PRAGMA journal_mode=WAL")
+        # Under WAL, NORMAL only syncs at checkpoints — a commit stays atomic
+        # but no longer pays an fsync of its own
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # The reminders table is small: a modest page cache plus an mmap
+        # window serves its reads without copying through the pager
+        self._conn.execute("PRAGMA cache_size=-8000")  # ~8 MiB
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA mmap_size=134217728")  # 128 MiB
+        # Bumped on every write, so list_active() output can be cached
+        self.version = 0
+        # Called after add/delete, so a waiting checker can re-plan its
+        # sleep.  May run on any thread.
+        self.on_change: Callable[[], None] | None = None
         self._init_table()
 
     def _init_table(self) -> None:
@@ -66,86 +89,103 @@ class ReminderStore:
                 conversation_id TEXT
             );
             CREATE INDEX IF NOT EXISTS idx_rem_trigger ON reminders(trigger_at);
-            CREATE INDEX IF NOT EXISTS idx_rem_fired   ON reminders(fired);
+            -- Pending-reminder lookups (due, next, active) are a range scan
+            -- on the fired = 0 prefix of this, already in trigger order.
+            -- It supersedes the old single-column index on fired.
+            CREATE INDEX IF NOT EXISTS idx_rem_fired_trigger ON reminders(fired, trigger_at);
+            DROP INDEX IF EXISTS idx_rem_fired;
         """)
         self._conn.commit()
 
     def add_reminder(
         self, message: str, trigger_at: float, conversation_id: str | None = None
     ) -> Reminder:
+        return self.add_many([(message, trigger_at)], conversation_id)[0]
+
+    def add_many(
+        self, items: list[tuple[str, float]], conversation_id: str | None = None
+    ) -> list[Reminder]:
+        """Insert several (message, trigger_at) reminders in one commit."""
         now = time.time()
-        cur = self._conn.execute(
-            "INSERT INTO reminders (message, trigger_at, created_at, fired, conversation_id) "
-            "VALUES (?, ?, ?, 0, ?)",
-            (message, trigger_at, now, conversation_id),
-        )
-        self._conn.commit()
-        return Reminder(
-            id=cur.lastrowid,
-            message=message,
-            trigger_at=trigger_at,
-            created_at=now,
-            fired=False,
-            conversation_id=conversation_id,
-        )
+        added = []
+        with self._conn:
+            for message, trigger_at in items:
+                cur = self._conn.execute(
+                    "INSERT INTO reminders (message, trigger_at, created_at, fired, conversation_id) "
+                    "VALUES (?, ?, ?, 0, ?)",
+                    (message, trigger_at, now, conversation_id),
+                )
+                added.append(Reminder(
+                    id=cur.lastrowid,
+                    message=message,
+                    trigger_at=trigger_at,
+                    created_at=now,
+                    fired=False,
+                    conversation_id=conversation_id,
+                ))
+        if added:
+            self.version += 1
+            if self.on_change:
+                self.on_change()
+        return added
 
     def get_due_reminders(self) -> list[Reminder]:
         now = time.time()
         rows = self._conn.execute(
             "SELECT id, message, trigger_at, created_at, fired, conversation_id "
-            "FROM reminders WHERE trigger_at <= ? AND fired = 0",
+            "FROM reminders WHERE fired = 0 AND trigger_at <= ? ORDER BY trigger_at",
             (now,),
         ).fetchall()
         return [
-            Reminder(id=r[0], message=r[1], trigger_at=r[2],
-                     created_at=r[3], fired=bool(r[4]), conversation_id=r[5])
+            Reminder(id=r["id"], message=r["message"], trigger_at=r["trigger_at"],
+                     created_at=r["created_at"], fired=bool(r["fired"]),
+                     conversation_id=r["conversation_id"])
             for r in rows
         ]
 
+    def get_next_trigger_at(self) -> float | None:
+        """Trigger time of the earliest unfired reminder, if any."""
+        return self._conn.execute(
+            "SELECT MIN(trigger_at) FROM reminders WHERE fired = 0"
+        ).fetchone()[0]
+
     def mark_fired(self, reminder_id: int) -> None:
+        self.mark_fired_many([reminder_id])
+
+    def mark_fired_many(self, ids: list[int]) -> None:
+        """Mark all *ids* fired with one UPDATE and one commit."""
+        if not ids:
+            return
         self._conn.execute(
-            "UPDATE reminders SET fired = 1 WHERE id = ?", (reminder_id,)
+            f"UPDATE reminders SET fired = 1 WHERE id IN ({','.join('?' * len(ids))})",
+            ids,
         )
         self._conn.commit()
+        self.version += 1
 
     def list_active(self) -> list[dict]:
-        rows = self._conn.execute(
+        cur = self._conn.execute(
             "SELECT id, message, trigger_at, created_at, conversation_id "
             "FROM reminders WHERE fired = 0 ORDER BY trigger_at ASC"
-        ).fetchall()
-        return [
-            {
-                "id": r[0],
-                "message": r[1],
-                "trigger_at": r[2],
-                "created_at": r[3],
-                "conversation_id": r[4],
-            }
-            for r in rows
-        ]
+        )
+        return [dict(r) for r in cur]
 
     def list_all(self) -> list[dict]:
-        rows = self._conn.execute(
+        cur = self._conn.execute(
             "SELECT id, message, trigger_at, created_at, fired, conversation_id "
             "FROM reminders ORDER BY trigger_at DESC LIMIT 50"
-        ).fetchall()
-        return [
-            {
-                "id": r[0],
-                "message": r[1],
-                "trigger_at": r[2],
-                "created_at": r[3],
-                "fired": bool(r[4]),
-                "conversation_id": r[5],
-            }
-            for r in rows
-        ]
+        )
+        return [{**r, "fired": bool(r["fired"])} for r in cur]
 
     def delete_reminder(self, reminder_id: int) -> bool:
         cur = self._conn.execute(
             "DELETE FROM reminders WHERE id = ?", (reminder_id,)
         )
         self._conn.commit()
+        if cur.rowcount:
+            self.version += 1
+            if self.on_change:
+                self.on_change()
         return cur.rowcount > 0
 
     def close(self) -> None:
@@ -156,6 +196,18 @@ class ReminderStore:
 # Time expression parser
 # ------------------------------------------------------------------
 
+# Compiled once; parse_time_expression() lower-cases its input first
+_COMPOUND_RE = re.compile(
+    r'in\s+'
+    r'(?:(\d+)\s*(?:hours?|hrs?|h)\s*(?:and\s*)?)?'
+    r'(?:(\d+)\s*(?:minutes?|mins?|m)\s*(?:and\s*)?)?'
+    r'(?:(\d+)\s*(?:seconds?|secs?|s))?'
+)
+_TOMORROW_RE = re.compile(r'tomorrow\s+(?:at\s+)?(\d{1,2})(?:[: ](\d{2}))?\s*(am|pm)?')
+_TODAY_RE = re.compile(r'today\s+(?:at\s+)?(\d{1,2})(?:[: ](\d{2}))?\s*(am|pm)?')
+_BARE_TIME_RE = re.compile(r'^(\d{1,2})(?:[: ](\d{2}))?\s*(am|pm)?$')
+
+
 def parse_time_expression(expr: str) -> float | None:
     """Parse a natural time expression into a unix timestamp.
 
@@ -174,13 +226,7 @@ def parse_time_expression(expr: str) -> float | None:
     now = datetime.now()
 
     # --- Compound relative: "in 1 hour 30 minutes", "in 1h 30m", "in 1 hour and 30 minutes" ---
-    compound = re.match(
-        r'in\s+'
-        r'(?:(\d+)\s*(?:hours?|hrs?|h)\s*(?:and\s*)?)?'
-        r'(?:(\d+)\s*(?:minutes?|mins?|m)\s*(?:and\s*)?)?'
-        r'(?:(\d+)\s*(?:seconds?|secs?|s))?',
-        expr,
-    )
+    compound = _COMPOUND_RE.match(expr)
     if compound and any(compound.group(i) for i in (1, 2, 3)):
         hours = int(compound.group(1) or 0)
         minutes = int(compound.group(2) or 0)
@@ -190,9 +236,7 @@ def parse_time_expression(expr: str) -> float | None:
             return (now + delta).timestamp()
 
     # --- "tomorrow [at] HH:MM [AM/PM]" or "tomorrow [at] H [AM/PM]" ---
-    m = re.match(
-        r'tomorrow\s+(?:at\s+)?(\d{1,2})(?:[: ](\d{2}))?\s*(am|pm)?', expr
-    )
+    m = _TOMORROW_RE.match(expr)
     if m:
         hour, minute = int(m.group(1)), int(m.group(2) or 0)
         ampm = m.group(3)
@@ -206,9 +250,7 @@ def parse_time_expression(expr: str) -> float | None:
         return target.timestamp()
 
     # --- "today [at] HH:MM [AM/PM]" ---
-    m = re.match(
-        r'today\s+(?:at\s+)?(\d{1,2})(?:[: ](\d{2}))?\s*(am|pm)?', expr
-    )
+    m = _TODAY_RE.match(expr)
     if m:
         hour, minute = int(m.group(1)), int(m.group(2) or 0)
         ampm = m.group(3)
@@ -222,7 +264,7 @@ def parse_time_expression(expr: str) -> float | None:
         return target.timestamp()
 
     # --- Bare time: "9:50 PM", "21:50", "3 PM", "3:00 pm", "7 35 PM" ---
-    m = re.match(r'^(\d{1,2})(?:[: ](\d{2}))?\s*(am|pm)?$', expr)
+    m = _BARE_TIME_RE.match(expr)
     if m:
         hour, minute = int(m.group(1)), int(m.group(2) or 0)
         ampm = m.group(3)
@@ -263,12 +305,28 @@ def strip_reminder_tags(text: str) -> str:
     return REMIND_TAG_RE.sub('', text).strip()
 
 
+def split_reminder_tags(text: str) -> tuple[str, list[tuple[str, str, str]]]:
+    """extract_reminder_tags() and strip_reminder_tags() in one pass.
+
+    Returns (text_without_tags, [(full_match, time_expression, reminder_message)]).
+    """
+    if "[" not in text:  # most replies carry no tag at all
+        return text.strip(), []
+    tags = []
+
+    def _take(m: re.Match) -> str:
+        tags.append((m.group(0), m.group(1).strip(), m.group(2).strip()))
+        return ''
+
+    return REMIND_TAG_RE.sub(_take, text).strip(), tags
+
+
 # ------------------------------------------------------------------
 # Notifications (delegated to notifier module)
 # ------------------------------------------------------------------
 
-def send_reminder_set_notification(message: str, trigger_at: float) -> bool:
-    """Notify all configured channels that a reminder has been set."""
+def _set_contents(message: str, trigger_at: float) -> tuple[str, str]:
+    """(Discord, WhatsApp) texts announcing a new reminder."""
     ts = int(trigger_at)
     discord_content = (
         f"\u23f0 **Reminder Set!**\n"
@@ -278,16 +336,13 @@ def send_reminder_set_notification(message: str, trigger_at: float) -> bool:
     whatsapp_content = (
         f"\u23f0 Reminder Set!\n"
         f"{message}\n"
-        f"Fires at: {datetime.fromtimestamp(trigger_at).strftime('%I:%M %p on %B %d')}"
+        f"Fires at: {format_trigger_time(trigger_at)}"
     )
-    d = send_discord(discord_content)
-    from notifier import send_whatsapp
-    w = send_whatsapp(whatsapp_content)
-    return d or w
+    return discord_content, whatsapp_content
 
 
-def send_reminder_fire_notification(message: str) -> bool:
-    """Notify all configured channels that a reminder is due."""
+def _fire_contents(message: str) -> tuple[str, str]:
+    """(Discord, WhatsApp) texts for a reminder that is due."""
     discord_content = (
         f"\U0001f514 <@{DISCORD_USER_ID}> **Time's up!**\n"
         f"\U0001f4dd {message}"
@@ -296,20 +351,66 @@ def send_reminder_fire_notification(message: str) -> bool:
         f"\U0001f514 Time's up!\n"
         f"{message}"
     )
+    return discord_content, whatsapp_content
+
+
+def send_reminder_set_notification(message: str, trigger_at: float) -> bool:
+    """Notify all configured channels that a reminder has been set."""
+    discord_content, whatsapp_content = _set_contents(message, trigger_at)
+    d = send_discord(discord_content)
+    w = send_whatsapp(whatsapp_content)
+    return d or w
+
+
+def queue_reminder_set_notification(message: str, trigger_at: float) -> bool:
+    """send_reminder_set_notification() on the notifier's worker thread,
+    so the caller doesn't wait on the webhooks."""
+    return send_in_background(send_reminder_set_notification, message, trigger_at)
+
+
+def send_reminder_fire_notification(message: str) -> bool:
+    """Notify all configured channels that a reminder is due."""
+    discord_content, whatsapp_content = _fire_contents(message)
     d = send_discord(discord_content)
-    from notifier import send_whatsapp
     w = send_whatsapp(whatsapp_content)
     return d or w
 
 
+async def send_reminder_fire_notification_async(message: str) -> bool:
+    """send_reminder_fire_notification() for the event loop, with both
+    channels sent concurrently."""
+    discord_content, whatsapp_content = _fire_contents(message)
+    d, w = await asyncio.gather(
+        send_discord_async(discord_content), send_whatsapp_async(whatsapp_content),
+        return_exceptions=True,
+    )
+    return d is True or w is True
+
+
 # ------------------------------------------------------------------
 # Helper: current time string for system prompt
 # ------------------------------------------------------------------
 
+# (unix minute, string) — the string only has minute resolution, so it is
+# formatted once per minute however many prompts are built in between
+_time_string: tuple[int, str] = (-1, "")
+
+
 def get_current_time_string() -> str:
     """Return a human-readable current date/time string for the AI."""
-    now = datetime.now()
-    return now.strftime("%A, %B %d, %Y at %I:%M %p")
+    global _time_string
+    minute = int(time.time() // 60)
+    cached_minute, text = _time_string
+    if minute != cached_minute:
+        text = datetime.fromtimestamp(minute * 60).strftime("%A, %B %d, %Y at %I:%M %p")
+        _time_string = (minute, text)
+    return text
+
+
+@lru_cache(maxsize=256)
+def format_trigger_time(trigger_at: float) -> str:
+    """Format a reminder's trigger time as e.g. "05:30 PM on March 04"."""
+    return datetime.fromtimestamp(trigger_at).strftime("%I:%M %p on %B %d")
 
 
 # ------------------------------------------------------------------
@@ -376,6 +477,37 @@ _REMINDER_PATTERNS = [
 ]
 
 
+# All nine as one alternation, so a message with no reminder in it (the
+# usual case) costs a single scan.  Each branch is a named group "p<i>";
+# its two inner groups are (time, message), or (message, time) for the
+# odd-numbered patterns where the time comes last.
+_COMBINED_RE = re.compile(
+    "|".join(f"(?P<p{i}>{p.pattern})" for i, p in enumerate(_REMINDER_PATTERNS)),
+    re.IGNORECASE,
+)
+_BRANCH_GROUPS: dict[str, tuple[int, int]] = {}
+for _i in range(len(_REMINDER_PATTERNS)):
+    _g = _COMBINED_RE.groupindex[f"p{_i}"]
+    _BRANCH_GROUPS[f"p{_i}"] = (_g + 2, _g + 1) if _i % 2 else (_g + 1, _g + 2)
+del _i, _g
+_REMIND_ME_RE = re.compile(r'remind\s+me', re.IGNORECASE)
+_LEADING_AT_RE = re.compile(r'^at\s+', re.IGNORECASE)
+
+
+def _reminder_candidate(time_expr: str, message: str) -> tuple[str, str] | None:
+    """(time_expression, message) if *time_expr* parses, else None."""
+    # Strip leading "at " from time if present for parser compatibility
+    time_clean = _LEADING_AT_RE.sub('', time_expr.strip())
+
+    # Clean up message — remove trailing punctuation
+    message = message.strip().rstrip('.,!?;: ')
+
+    # Validate time parses
+    if parse_time_expression(time_clean) is not None:
+        return time_clean, message
+    return None
+
+
 def try_parse_user_reminder(user_message: str) -> tuple[str, str] | None:
     """Try to detect a reminder request in the user's message.
 
@@ -386,31 +518,30 @@ def try_parse_user_reminder(user_message: str) -> tuple[str, str] | None:
     """
     text = user_message.strip()
 
-    for i, pattern in enumerate(_REMINDER_PATTERNS):
-        m = pattern.search(text)
-        if not m:
+    m = _COMBINED_RE.search(text)
+    if m is None:
+        return None
+
+    # With a single "remind me" every pattern can only match where this one
+    # did, so the branch taken is the first pattern that matches at all —
+    # if its time doesn't parse, only the patterns after it are left.  With
+    # several, go through all of them in priority order.
+    first = 0
+    if _REMIND_ME_RE.search(text, m.start() + 1) is None:
+        time_g, msg_g = _BRANCH_GROUPS[m.lastgroup]
+        found = _reminder_candidate(m.group(time_g), m.group(msg_g))
+        if found is not None:
+            return found
+        first = int(m.lastgroup[1:]) + 1
+
+    for i in range(first, len(_REMINDER_PATTERNS)):
+        pm = _REMINDER_PATTERNS[i].search(text)
+        if not pm:
             continue
-
-        g1, g2 = m.group(1).strip(), m.group(2).strip()
-
-        # For patterns where time comes SECOND (odd indices 1, 3, 5, 7),
-        # g1 = message, g2 = time.
-        # For patterns where time comes FIRST (even indices 0, 2, 4, 6, 8),
-        # g1 = time, g2 = message.
-        if i in (1, 3, 5, 7):
-            time_expr, message = g2, g1
-        else:
-            time_expr, message = g1, g2
-
-        # Strip leading "at " from time if present for parser compatibility
-        time_clean = re.sub(r'^at\s+', '', time_expr, flags=re.IGNORECASE)
-
-        # Clean up message — remove trailing punctuation
-        message = message.rstrip('.,!?;: ')
-
-        # Validate time parses
-        trigger_at = parse_time_expression(time_clean)
-        if trigger_at is not None:
-            return time_clean, message
+        g1, g2 = pm.group(1), pm.group(2)
+        # Odd patterns put the message first, the time second
+        found = _reminder_candidate(g2, g1) if i % 2 else _reminder_candidate(g1, g2)
+        if found is not None:
+            return found
 
     return None
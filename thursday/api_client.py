@@ -2,21 +2,51 @@
 HTTP client for llama-server's OpenAI-compatible API.
 
 Supports both streaming and non-streaming responses.
-Uses raw `requests` — no SDK dependencies.
+Uses a plain `httpx.Client` — no SDK dependencies.  The CLI is a
+synchronous REPL, so the sync client is the right fit; llama-server is
+plain HTTP on localhost, where HTTP/2 isn't negotiated, so it speaks
+keep-alive HTTP/1.1 over one pooled connection.
 
-Extension point: swap this for an async client (httpx / aiohttp)
-if you later move to an async architecture.
+Extension point: swap this for httpx.AsyncClient if you later move to
+an async architecture (thursday-web's llama_client does exactly that).
 """
 
-import json
+import io
 import sys
-from typing import Generator
+from typing import Iterator
 
-import requests
+import httpx
+import orjson
 
 from config import CHAT_ENDPOINT, MAX_TOKENS, MODEL_NAME, TEMPERATURE, TOP_P
 
 
+# Streamed tokens are written out once this many characters are pending
+_FLUSH_CHARS = 64
+
+
+def _iter_lines(resp: httpx.Response) -> Iterator[bytes]:
+    """Split a streamed body into lines, as bytes — nothing is decoded
+    until a token has been pulled out of a payload.
+
+    Lines are sliced off a bytearray at an advancing ``start`` cursor;
+    consumed bytes are only dropped once they make up over half of it.
+    """
+    buf = bytearray()
+    start = 0
+    for chunk in resp.iter_bytes():
+        buf += chunk
+        while (nl := buf.find(b"\n", start)) != -1:
+            end = nl - 1 if nl > start and buf[nl - 1] == 0x0D else nl  # drop \r
+            yield bytes(memoryview(buf)[start:end])  # the one copy per line
+            start = nl + 1
+        if start > len(buf) // 2:
+            del buf[:start]
+            start = 0
+    if start < len(buf):
+        yield bytes(memoryview(buf)[start:]).rstrip(b"\r")
+
+
 class LlamaClient:
     """Thin wrapper around llama-server /v1/chat/completions."""
 
@@ -27,9 +57,14 @@ class LlamaClient:
     ) -> None:
         self._endpoint = endpoint
         self._timeout = timeout
-        self._session = requests.Session()
-        # Keep-alive for lower latency on repeated calls.
-        self._session.headers.update({"Content-Type": "application/json"})
+        # Keep-alive for lower latency on repeated calls.  Connecting gets
+        # its own short timeout so a dead server is reported quickly; the
+        # long one covers waiting on generation.
+        self._client = httpx.Client(
+            headers={"Content-Type": "application/json"},
+            timeout=httpx.Timeout(timeout, connect=10.0),
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=90),
+        )
 
     # ------------------------------------------------------------------
     # Public API
@@ -65,12 +100,12 @@ class LlamaClient:
     def health_check(self) -> bool:
         """Quick connectivity test against the server."""
         try:
-            r = self._session.get(
+            r = self._client.get(
                 self._endpoint.replace("/v1/chat/completions", "/health"),
                 timeout=5,
             )
             return r.status_code == 200
-        except requests.ConnectionError:
+        except httpx.TransportError:
             return False
 
     # ------------------------------------------------------------------
@@ -79,63 +114,72 @@ class LlamaClient:
 
     def _stream_response(self, payload: dict) -> str:
         """Stream SSE tokens, print live, return full text."""
-        collected: list[str] = []
+        # The reply accumulates in place; no list of tokens to join at the end
+        collected = io.StringIO()
+        # Tokens reach the terminal a line (or _FLUSH_CHARS) at a time, not
+        # one write + flush per token — console writes are the slow part
+        pending: list[str] = []
+        pending_len = 0
+        write, flush = sys.stdout.write, sys.stdout.flush
         try:
-            resp = self._session.post(
-                self._endpoint,
-                json=payload,
-                stream=True,
-                timeout=self._timeout,
-            )
-            resp.raise_for_status()
-
-            for line in resp.iter_lines(decode_unicode=True):
-                if not line:
-                    continue
-                if line.startswith("data: "):
-                    data = line[6:]
-                    if data.strip() == "[DONE]":
-                        break
-                    try:
-                        chunk = json.loads(data)
-                        delta = chunk["choices"][0].get("delta", {})
-                        token = delta.get("content", "")
-                        if token:
-                            sys.stdout.write(token)
-                            sys.stdout.flush()
-                            collected.append(token)
-                    except (json.JSONDecodeError, KeyError, IndexError):
-                        continue  # skip malformed chunks
-
-            sys.stdout.write("\n")
-            sys.stdout.flush()
-
-        except requests.ConnectionError:
+            with self._client.stream("POST", self._endpoint, content=orjson.dumps(payload)) as resp:
+                resp.raise_for_status()
+
+                for line in _iter_lines(resp):
+                    if line.startswith(b"data: "):
+                        # Role/finish chunks carry no token: skip the parse
+                        if b'"content"' not in line:
+                            if line[6:].strip() == b"[DONE]":
+                                break
+                            continue
+                        try:
+                            # A view past the prefix: the payload isn't copied
+                            chunk = orjson.loads(memoryview(line)[6:])
+                            delta = chunk["choices"][0].get("delta", {})
+                            token = delta.get("content", "")
+                            if token:
+                                collected.write(token)
+                                pending.append(token)
+                                pending_len += len(token)
+                                if "\n" in token or pending_len > _FLUSH_CHARS:
+                                    write("".join(pending))
+                                    flush()
+                                    pending.clear()
+                                    pending_len = 0
+                        except (orjson.JSONDecodeError, KeyError, IndexError):
+                            continue  # skip malformed chunks
+
+            pending.append("\n")
+
+        except httpx.ConnectError:
             return "[Error: Cannot reach llama-server. Is it running?]"
-        except requests.Timeout:
+        except httpx.TimeoutException:
             return "[Error: Request timed out.]"
-        except requests.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             return f"[Error: HTTP {e.response.status_code}]"
+        finally:
+            # Whatever is still buffered, even if the stream broke off
+            if pending:
+                write("".join(pending))
+                flush()
 
-        return "".join(collected)
+        return collected.getvalue()
 
     def _blocking_response(self, payload: dict) -> str:
         """Non-streaming single response."""
         try:
-            resp = self._session.post(
-                self._endpoint, json=payload, timeout=self._timeout
-            )
+            resp = self._client.post(self._endpoint, content=orjson.dumps(payload))
             resp.raise_for_status()
-            data = resp.json()
+            data = orjson.loads(resp.content)
             return data["choices"][0]["message"]["content"]
-        except requests.ConnectionError:
+        except httpx.ConnectError:
             return "[Error: Cannot reach llama-server. Is it running?]"
-        except requests.Timeout:
+        except httpx.TimeoutException:
             return "[Error: Request timed out.]"
-        except requests.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             return f"[Error: HTTP {e.response.status_code}]"
         except (KeyError, IndexError):
             return "[Error: Unexpected response format.]"
 
     def close(self) -> None:
-        self._session.close()
+        self._client.close()
@@ -14,6 +14,8 @@ index before constructing the prompt, to pull in semantically relevant
 past conversations or documents.
 """
 
+import threading
+
 from api_client import LlamaClient
 from memory import MemoryStore
 from personality import Personality
@@ -26,6 +28,7 @@ class Assistant:
         self.personality = Personality()
         self.memory = MemoryStore()
         self.client = LlamaClient()
+        self._warm_thread: threading.Thread | None = None
 
     # ------------------------------------------------------------------
     # Main entry point
@@ -78,13 +81,14 @@ class Assistant:
         # 1. Personality
         messages.append(self.personality.as_system_message())
 
+        # Facts and history are read together
+        facts_block, history = self.memory.get_prompt_context()
+
         # 2. Long-term facts (optional second system block)
-        facts_block = self.memory.get_facts_block()
         if facts_block:
             messages.append({"role": "system", "content": facts_block})
 
         # 3. Recent conversation history (already includes current user msg)
-        history = self.memory.get_recent_messages()
         messages.extend(history)
 
         return messages
@@ -105,6 +109,19 @@ class Assistant:
         """Check if the LLM server is reachable."""
         return self.client.health_check()
 
+    def warm_up(self) -> None:
+        """Refresh the pooled connection to llama-server in the background
+        (e.g. while waiting on input()), so the next request doesn't have
+        to reconnect if the server dropped the idle one.
+
+        At most one runs at a time: with the server down each blocks for
+        the connect timeout, so they'd otherwise pile up.
+        """
+        if self._warm_thread is not None and self._warm_thread.is_alive():
+            return
+        self._warm_thread = threading.Thread(target=self.client.health_check, daemon=True)
+        self._warm_thread.start()
+
     # ------------------------------------------------------------------
     # Cleanup
     # ------------------------------------------------------------------
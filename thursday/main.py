@@ -89,6 +89,7 @@ def _chat_loop(bot: Assistant) -> None:
         print("\033[93mThursday:\033[0m ", end="", flush=True)
         bot.respond(user_input)
         # Response is printed via streaming inside api_client; newline already added.
+        bot.warm_up()  # overlaps with the user typing the next message
 
 
 def _handle_command(cmd: str, bot: Assistant) -> bool:
@@ -10,6 +10,7 @@ embeddings model (e.g. sentence-transformers) for semantic memory retrieval.
 Add a vector store (FAISS / Chroma) alongside the SQLite facts table.
 """
 
+import re
 import sqlite3
 import time
 from dataclasses import dataclass
@@ -23,6 +24,15 @@ from config import (
 )
 
 
+# Every trigger prefix as one anchored, case-insensitive alternation, so a
+# message is checked in a single scan with no lower-cased or stripped copy
+# of it; leading whitespace is skipped by the pattern itself
+_TRIGGER_RE = re.compile(
+    r"\s*(?:" + "|".join(re.escape(p) for p in MEMORY_TRIGGER_PREFIXES) + ")",
+    re.IGNORECASE,
+)
+
+
 @dataclass(slots=True)
 class Fact:
     id: int
@@ -35,9 +45,18 @@ class MemoryStore:
 
     def __init__(self, db_path: str | None = None) -> None:
         self._db_path = str(db_path or DB_FILE)
-        self._conn = sqlite3.connect(self._db_path)
+        # Autocommit: every write here is one statement, so each is its own
+        # transaction with no separate commit() round-trip
+        self._conn = sqlite3.connect(self._db_path, isolation_level=None)
         self._conn.execute("PRAGMA journal_mode=WAL")  # faster concurrent reads
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # durable enough under WAL
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+        self._conn.execute("PRAGMA cache_size=-8000")  # ~8 MiB
         self._init_tables()
+        # Rendered facts block; rebuilt only after a fact is added or removed
+        self._facts_block_cache: str | None = None
+        self._facts_dirty = True
 
     # ------------------------------------------------------------------
     # Schema
@@ -59,23 +78,35 @@ class MemoryStore:
                 created_at REAL   NOT NULL
             );
 
-            CREATE INDEX IF NOT EXISTS idx_chat_ts ON chat_history(timestamp);
+            -- chat_history is only ever read and pruned by id (the rowid),
+            -- so a timestamp index would be pure per-insert upkeep
+            DROP INDEX IF EXISTS idx_chat_ts;
             CREATE INDEX IF NOT EXISTS idx_facts_ts ON long_term_facts(created_at);
         """)
-        self._conn.commit()
 
     # ------------------------------------------------------------------
     # Short-term memory
     # ------------------------------------------------------------------
 
     def add_message(self, role: str, content: str) -> None:
-        """Append a message to conversation history."""
-        self._conn.execute(
-            "INSERT INTO chat_history (role, content, timestamp) VALUES (?, ?, ?)",
-            (role, content, time.time()),
-        )
-        self._conn.commit()
-        self._maybe_prune()
+        """Append a message to conversation history.
+
+        Written straight away (synchronous=NORMAL under WAL means the commit
+        doesn't fsync), with the prune in the same transaction.
+        """
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.execute(
+                "INSERT INTO chat_history (role, content, timestamp) VALUES (?, ?, ?)",
+                (role, content, time.time()),
+            )
+            # A range delete on the primary key: close to free when there's
+            # nothing to prune, so it runs on every write
+            self._maybe_prune()
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
 
     def get_recent_messages(self, limit: int = SHORT_TERM_LIMIT) -> list[dict]:
         """Return the last `limit` messages as OpenAI-style dicts."""
@@ -89,21 +120,19 @@ class MemoryStore:
     def clear_history(self) -> None:
         """Wipe all short-term conversation history."""
         self._conn.execute("DELETE FROM chat_history")
-        self._conn.commit()
 
     def _maybe_prune(self) -> None:
-        """Delete oldest messages when table exceeds threshold."""
-        count = self._conn.execute(
-            "SELECT COUNT(*) FROM chat_history"
-        ).fetchone()[0]
-        if count > DB_PRUNE_THRESHOLD:
-            excess = count - DB_PRUNE_THRESHOLD
-            self._conn.execute(
-                "DELETE FROM chat_history WHERE id IN "
-                "(SELECT id FROM chat_history ORDER BY id ASC LIMIT ?)",
-                (excess,),
-            )
-            self._conn.commit()
+        """Delete oldest messages when table exceeds threshold.
+
+        Only pruning ever deletes single rows (clear_history() takes them
+        all), so ids stay contiguous and "older than the newest N" is a
+        range on the primary key — no COUNT(*) scan needed.
+        """
+        self._conn.execute(
+            "DELETE FROM chat_history "
+            "WHERE id <= (SELECT MAX(id) FROM chat_history) - ?",
+            (DB_PRUNE_THRESHOLD,),
+        )
 
     # ------------------------------------------------------------------
     # Long-term memory
@@ -117,13 +146,14 @@ class MemoryStore:
         Extension point: replace this with an LLM-based extraction call
         or an NER pipeline for richer fact types.
         """
-        lower = user_message.lower().strip()
-        for prefix in MEMORY_TRIGGER_PREFIXES:
-            if lower.startswith(prefix):
-                # Store the original-case version, trimmed of the trigger word.
-                fact = user_message.strip()
-                self._store_fact(fact)
-                return fact
+        m = _TRIGGER_RE.match(user_message)
+        # The trigger must end inside the text proper, as if matched on the
+        # stripped message ("i use " alone is not a fact)
+        if m and m.end() <= len(user_message.rstrip()):
+            # Store the original-case version, trimmed of the trigger word.
+            fact = user_message.strip()
+            self._store_fact(fact)
+            return fact
         return None
 
     def _store_fact(self, fact: str) -> None:
@@ -133,7 +163,7 @@ class MemoryStore:
                 "INSERT INTO long_term_facts (content, created_at) VALUES (?, ?)",
                 (fact, time.time()),
             )
-            self._conn.commit()
+            self._facts_dirty = True
         except sqlite3.IntegrityError:
             pass  # duplicate, skip silently
 
@@ -151,26 +181,57 @@ class MemoryStore:
         Build a plain-text summary of stored facts for prompt injection.
         Returns None if no facts exist.
         """
-        facts = self.get_facts()
-        if not facts:
+        if self._facts_dirty:
+            self._facts_block_cache = self._render_facts_block(self._conn.cursor())
+            self._facts_dirty = False
+        return self._facts_block_cache
+
+    @staticmethod
+    def _render_facts_block(cur: sqlite3.Cursor) -> str | None:
+        # SQLite decorates each line, so Python only joins them
+        lines = [line for (line,) in cur.execute(
+            "SELECT '- ' || content FROM long_term_facts ORDER BY created_at DESC LIMIT ?",
+            (LONG_TERM_MAX_INJECT,),
+        )]
+        if not lines:
             return None
-        lines = [f"- {f.content}" for f in facts]
         return "Things you know about the user:\n" + "\n".join(lines)
 
+    def get_prompt_context(
+        self, limit: int = SHORT_TERM_LIMIT
+    ) -> tuple[str | None, list[dict]]:
+        """(facts block, recent messages) for one prompt build.
+
+        The facts block comes from get_facts_block()'s cache whenever the
+        facts are unchanged; otherwise both queries share one cursor.
+        """
+        cur = self._conn.cursor()
+        if self._facts_dirty:
+            self._facts_block_cache = self._render_facts_block(cur)
+            self._facts_dirty = False
+        rows = cur.execute(
+            "SELECT role, content FROM chat_history ORDER BY id DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        return self._facts_block_cache, [{"role": r, "content": c} for r, c in reversed(rows)]
+
     def delete_fact(self, fact_id: int) -> bool:
         """Remove a specific long-term fact by ID."""
         cur = self._conn.execute(
             "DELETE FROM long_term_facts WHERE id = ?", (fact_id,)
         )
-        self._conn.commit()
+        if cur.rowcount > 0:
+            self._facts_dirty = True
         return cur.rowcount > 0
 
     def list_facts_formatted(self) -> str:
         """Pretty-print all facts for the /memory command."""
-        facts = self.get_facts(limit=100)
-        if not facts:
+        lines = [line for (line,) in self._conn.execute(
+            "SELECT '  [' || id || '] ' || content FROM long_term_facts "
+            "ORDER BY created_at DESC LIMIT 100"
+        )]
+        if not lines:
             return "No long-term memories stored yet."
-        lines = [f"  [{f.id}] {f.content}" for f in facts]
         return "Long-term memories:\n" + "\n".join(lines)
 
     # ------------------------------------------------------------------
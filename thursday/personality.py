@@ -6,25 +6,46 @@ Extension point: swap this for a dynamic personality selector
 or per-user personality profiles.
 """
 
+import os
 from pathlib import Path
 from config import PERSONALITY_FILE
 
 
 class Personality:
-    """Loads and caches the system personality prompt."""
+    """Loads and caches the system personality prompt.
+
+    Edits to the file are picked up on the next load() — it stats the
+    file and only re-reads it when the mtime has moved — so /reload is
+    merely a way to force it.
+    """
 
     def __init__(self, filepath: Path = PERSONALITY_FILE) -> None:
         self._filepath = filepath
         self._text: str | None = None
+        self._mtime: int | None = None
+        self._sys_msg: dict | None = None
 
     def load(self) -> str:
-        """Read personality file from disk. Caches after first read."""
-        if self._text is None:
-            if not self._filepath.exists():
-                raise FileNotFoundError(
-                    f"Personality file not found: {self._filepath}"
-                )
-            self._text = self._filepath.read_text(encoding="utf-8").strip()
+        """Read personality file from disk. Cached while its mtime holds."""
+        if self._text is not None:
+            try:
+                if os.stat(self._filepath).st_mtime_ns == self._mtime:
+                    return self._text
+            except OSError:
+                return self._text  # keep serving the last good text
+        try:
+            # mtime via fstat on the same descriptor, so it always belongs
+            # to the bytes that were read
+            with open(self._filepath, encoding="utf-8") as f:
+                self._mtime = os.fstat(f.fileno()).st_mtime_ns
+                data = f.read()
+        except FileNotFoundError:
+            if self._text is not None:
+                return self._text  # vanished between the stat and the open
+            raise FileNotFoundError(
+                f"Personality file not found: {self._filepath}"
+            ) from None
+        self._text = data.strip()
         return self._text
 
     def reload(self) -> str:
@@ -33,5 +54,12 @@ class Personality:
         return self.load()
 
     def as_system_message(self) -> dict:
-        """Return personality as an OpenAI-style system message dict."""
-        return {"role": "system", "content": self.load()}
+        """Return personality as an OpenAI-style system message dict.
+
+        The same dict is handed out until the text changes, so callers
+        must treat it as read-only.
+        """
+        text = self.load()
+        if self._sys_msg is None or self._sys_msg["content"] is not text:
+            self._sys_msg = {"role": "system", "content": text}
+        return self._sys_msg